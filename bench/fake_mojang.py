@@ -0,0 +1,204 @@
+import argparse
+import hashlib
+import http.server
+import io
+import json
+import random
+import sys
+import threading
+import time
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+META = "https://piston-meta.mojang.com/v1/packages/"
+DATA = "https://piston-data.mojang.com/v1/objects/"
+LIBRARIES = "https://libraries.minecraft.net/"
+RESOURCES = "https://resources.download.minecraft.net/"
+MANIFEST = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+
+
+def _natives_jar(rng):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name in ("liblwjgl.so", "lwjgl.dll", "liblwjgl.dylib"):
+            zf.writestr(name, rng.randbytes(4096))
+        zf.writestr("META-INF/MANIFEST.MF", b"Manifest-Version: 1.0\n")
+    return buf.getvalue()
+
+
+def parse_size(text):
+    text = str(text).strip().lower()
+    units = {"k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(float(text or 0))
+
+
+class FakeMojang:
+    def __init__(self, versions=50, assets=4000, libraries=40, asset_size=2048, library_size=64 << 10,
+                 client_size=1 << 20, seed=1):
+        self.seed = seed
+        self.client_size = client_size
+        self.files = {}
+        self.version_ids = [f"bench-{i}" for i in range(versions)]
+        self._lazy = {}
+        self._lock = threading.Lock()
+        rng = random.Random(seed)
+        objects = {}
+        for i in range(assets):
+            data = rng.randbytes(max(1, int(asset_size * rng.uniform(0.25, 1.75))))
+            h = hashlib.sha1(data).hexdigest()
+            self.files[f"{RESOURCES}{h[:2]}/{h}"] = data
+            objects[f"minecraft/bench/{i}.bin"] = {"hash": h, "size": len(data)}
+        index_sha1, index_size = self._add(f"{META}assets/bench.json", json.dumps({"objects": objects}).encode())
+        libs = []
+        for i in range(libraries):
+            path = f"org/bench/lib{i}/1.0/lib{i}-1.0.jar"
+            sha1, size = self._add(LIBRARIES + path, rng.randbytes(library_size))
+            libs.append({"name": f"org.bench:lib{i}:1.0",
+                         "downloads": {"artifact": {"path": path, "url": LIBRARIES + path, "sha1": sha1, "size": size}}})
+        path = "org/bench/natives/1.0/natives-1.0-natives.jar"
+        sha1, size = self._add(LIBRARIES + path, _natives_jar(rng))
+        libs.append({"name": "org.bench:natives:1.0", "extract": {"exclude": ["META-INF/"]},
+                     "natives": {"linux": "natives", "windows": "natives", "osx": "natives"},
+                     "downloads": {"classifiers": {"natives": {"path": path, "url": LIBRARIES + path,
+                                                               "sha1": sha1, "size": size}}}})
+        self.libraries = libs
+        self.asset_index = {"id": "bench", "url": f"{META}assets/bench.json", "sha1": index_sha1, "size": index_size,
+                            "totalSize": sum(o["size"] for o in objects.values())}
+        released = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        entries = []
+        for n, version_id in enumerate(self.version_ids):
+            kind = "snapshot" if n % 5 == 4 else "release"
+            sha1, _ = self._add(f"{META}{version_id}.json", json.dumps(self.version_json(version_id, kind)).encode())
+            entries.append({"id": version_id, "type": kind,
+                            "url": f"{META}{version_id}.json", "sha1": sha1,
+                            "time": (released - timedelta(days=n)).isoformat(),
+                            "releaseTime": (released - timedelta(days=n)).isoformat()})
+        latest = self.version_ids[0] if self.version_ids else None
+        self.manifest = {"latest": {"release": latest, "snapshot": latest}, "versions": entries}
+        self._add(MANIFEST, json.dumps(self.manifest).encode())
+
+    def _add(self, url, data):
+        self.files[url] = data
+        return hashlib.sha1(data).hexdigest(), len(data)
+
+    def _client_jar(self, version_id):
+        with self._lock:
+            if version_id not in self._lazy:
+                self._lazy[version_id] = random.Random(f"{self.seed}/{version_id}").randbytes(self.client_size)
+            return self._lazy[version_id]
+
+    def version_json(self, version_id, kind="release"):
+        client = self._client_jar(version_id)
+        return {
+            "id": version_id,
+            "type": kind,
+            "mainClass": "net.minecraft.client.main.Main",
+            "assets": "bench",
+            "assetIndex": self.asset_index,
+            "downloads": {"client": {"url": f"{DATA}{version_id}/client.jar",
+                                     "sha1": hashlib.sha1(client).hexdigest(), "size": len(client)}},
+            "libraries": self.libraries,
+            "arguments": {
+                "game": ["--username", "${auth_player_name}", "--version", "${version_name}",
+                         "--gameDir", "${game_directory}", "--assetsDir", "${assets_root}",
+                         "--assetIndex", "${assets_index_name}", "--uuid", "${auth_uuid}",
+                         "--accessToken", "${auth_access_token}"],
+                "jvm": ["-Djava.library.path=${natives_directory}", "-cp", "${classpath}"],
+            },
+        }
+
+    def get(self, url):
+        data = self.files.get(url)
+        if data is None and url.startswith(DATA) and url.endswith("/client.jar"):
+            version_id = url[len(DATA):-len("/client.jar")]
+            if version_id in self.version_ids:
+                data = self._client_jar(version_id)
+        return data
+
+
+def make_handler(fake, latency=0.0, bandwidth=0):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = "https://" + self.path.lstrip("/")
+            if latency:
+                time.sleep(latency)
+            data = fake.get(url)
+            if data is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start = 0
+            ranged = self.headers.get("Range", "")
+            if ranged.startswith("bytes="):
+                start = int(ranged[6:].split("-")[0] or 0)
+                if start >= len(data):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(data)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(data) - start))
+            self.end_headers()
+            self._send(memoryview(data)[start:])
+
+        def _send(self, view):
+            if not bandwidth:
+                self.wfile.write(view)
+                return
+            chunk = max(bandwidth // 50, 1024)
+            t0 = time.perf_counter()
+            for sent in range(0, len(view), chunk):
+                self.wfile.write(view[sent:sent + chunk])
+                delay = (sent + chunk) / bandwidth - (time.perf_counter() - t0)
+                if delay > 0:
+                    time.sleep(delay)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(fake, port=0, latency=0.0, bandwidth=0, bind="127.0.0.1"):
+    server = http.server.ThreadingHTTPServer((bind, port), make_handler(fake, latency, bandwidth))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-mojang", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a synthetic Mojang download tree in the /<host>/<path> "
+                                                 "mirror layout (use it with ASPHALT_MIRROR)")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--versions", type=int, default=50)
+    parser.add_argument("--assets", type=int, default=4000)
+    parser.add_argument("--libraries", type=int, default=40)
+    parser.add_argument("--asset-size", default="2k", help="mean asset object size")
+    parser.add_argument("--client-size", default="1m")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--bandwidth", default="0", help="bytes per second per connection, e.g. 10m (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    fake = FakeMojang(args.versions, args.assets, args.libraries, parse_size(args.asset_size),
+                      client_size=parse_size(args.client_size), seed=args.seed)
+    server = serve(fake, args.port, args.latency, parse_size(args.bandwidth))
+    print(f"http://127.0.0.1:{server.server_address[1]}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+BASELINE_FILE = os.path.join(BENCH_DIR, "baselines.json")
+GROUPS = ("config", "scan", "dropdown", "startup", "install", "spawn")
+
+sys.path.insert(0, BENCH_DIR)
+from synthetic import make_fake_java, make_minecraft_tree, synthetic_manifest  # noqa: E402
+
+
+def timed(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return min(samples)
+
+
+def start_server(args):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, "fake_mojang.py"), "--versions", str(args.remote),
+         "--assets", str(args.assets), "--latency", str(args.latency), "--bandwidth", args.bandwidth],
+        stdout=subprocess.PIPE, text=True)
+    return proc, proc.stdout.readline().strip()
+
+
+def bench_config(launcher, ctx, args):
+    config_file = os.path.join(ctx["work"], "bench_config.json")
+    store = launcher.StateStore(config_file, os.path.join(ctx["work"], "bench_played.json"), delay=0)
+    counter = iter(range(1 << 30))
+
+    def write():
+        store.update_config(username=f"bench{next(counter)}")
+        store.flush()
+
+    return {"config_write": timed(write, args.repeat * 20),
+            "config_read": timed(lambda: launcher.StateStore(config_file), args.repeat * 20)}
+
+
+def bench_scan(launcher, ctx, args):
+    mc_dir = ctx["local_dir"]
+
+    def forget():
+        launcher._local_indexes.clear()
+        shutil.rmtree(launcher.LOCAL_INDEX_DIR, ignore_errors=True)
+
+    cold = timed(lambda: launcher._scan_local_versions(mc_dir), args.repeat, forget)
+    restart = timed(lambda: launcher._scan_local_versions(mc_dir), args.repeat * 5, launcher._local_indexes.clear)
+    warm = timed(lambda: launcher._scan_local_versions(mc_dir), args.repeat * 20)
+    return {"scan_local_cold": cold, "scan_local_restart": restart, "scan_local_warm": warm}
+
+
+def bench_dropdown(launcher, ctx, args):
+    manifest = synthetic_manifest(args.remote * 20)
+    launcher._scan_local_versions(ctx["local_dir"])
+    return {"dropdown_refresh": timed(lambda: launcher.get_available_versions(manifest, ctx["local_dir"]),
+                                      args.repeat * 5)}
+
+
+def bench_startup(launcher, ctx, args):
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    cwd = os.path.join(ctx["work"], "gui")
+    os.makedirs(cwd, exist_ok=True)
+    totals, walls = [], []
+    for _ in range(args.repeat + 1):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--profile-startup"],
+                             capture_output=True, text=True, env=env, cwd=cwd, timeout=120).stderr
+        walls.append((time.perf_counter() - t0) * 1000)
+        total = [line.split()[-2] for line in out.splitlines() if line.startswith("total")]
+        if not total:
+            raise RuntimeError(f"GUI did not report startup timings:\n{out}")
+        totals.append(float(total[0]))
+    return {"startup_to_version_list": min(totals[1:]), "startup_process": min(walls[1:])}
+
+
+def bench_install(launcher, ctx, args):
+    samples, rates = [], []
+    for n in range(args.repeat):
+        shutil.rmtree(launcher.STORE_DIR, ignore_errors=True)
+        mc_dir = os.path.join(ctx["work"], "install", str(n))
+        engine = launcher.DownloadEngine(jobs=args.jobs, store=launcher.ObjectStore())
+        t0 = time.perf_counter()
+        try:
+            launcher.install_versions([ctx["version"]], mc_dir, engine=engine)
+        finally:
+            engine.close()
+        elapsed = time.perf_counter() - t0
+        span = [s for s in launcher.TRACER.spans if s[0] == "install.download"][-1]
+        samples.append(elapsed * 1000)
+        rates.append((span[5]["bytes"] / elapsed / (1 << 20), span[5]["files"] / elapsed))
+    engine = launcher.DownloadEngine(jobs=args.jobs, store=launcher.ObjectStore())
+    t0 = time.perf_counter()
+    try:
+        launcher.install_versions([ctx["version"]], os.path.join(ctx["work"], "install", "dedupe"), engine=engine)
+    finally:
+        engine.close()
+    ctx["spawn_dir"] = os.path.join(ctx["work"], "install", "0")
+    mb, files = statistics.median(r[0] for r in rates), statistics.median(r[1] for r in rates)
+    print(f"  install throughput: {mb:.1f} MB/s, {files:.0f} files/s", file=sys.stderr)
+    return {"install_cold": min(samples), "install_from_store": (time.perf_counter() - t0) * 1000}
+
+
+def bench_spawn(launcher, ctx, args):
+    java = args.java or make_fake_java(ctx["work"])
+    if java is None:
+        print("  spawn: skipped, pass --java on this platform", file=sys.stderr)
+        return {}
+    mc_dir = ctx.get("spawn_dir")
+    if mc_dir is None:
+        mc_dir = os.path.join(ctx["work"], "spawn")
+        launcher.install_versions([ctx["version"]], mc_dir)
+
+    def spawn():
+        command = launcher.build_launch_command("Bench", ctx["version"], java, [], "none", mc_dir)
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=mc_dir)
+        proc.stdout.readline()
+        proc.stdout.close()
+        proc.wait()
+
+    def forget_plans():
+        launcher._launch_plans.clear()
+        shutil.rmtree(launcher.LAUNCH_PLAN_DIR, ignore_errors=True)
+
+    return {"spawn_cold": timed(spawn, args.repeat * 2, forget_plans), "spawn_warm": timed(spawn, args.repeat * 4)}
+
+
+def compare(results, baseline, tolerance, slack_ms):
+    failed = []
+    print(f"{'benchmark':<26}{'best':>12}{'baseline':>12}{'change':>9}")
+    for name, ms in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<26}{ms:>9.2f} ms{'-':>12}{'':>9}")
+            continue
+        change = (ms - base) / base * 100 if base else 0.0
+        regressed = ms > base * (1 + tolerance) + slack_ms
+        print(f"{name:<26}{ms:>9.2f} ms{base:>9.2f} ms{change:>+8.0f}%{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            failed.append(name)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asphalt Launcher benchmarks against a local fake Mojang server")
+    parser.add_argument("groups", nargs="*", help=f"any of {', '.join(GROUPS)} (default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--local", type=int, default=200, help="versions in the synthetic .minecraft tree")
+    parser.add_argument("--remote", type=int, default=50, help="versions served by the fake server")
+    parser.add_argument("--assets", type=int, default=4000, help="asset objects per version")
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds added to every request")
+    parser.add_argument("--bandwidth", default="0", help="bytes per second per connection, e.g. 20m")
+    parser.add_argument("-j", "--jobs", type=int, default=16)
+    parser.add_argument("--java", help="java executable for the spawn benchmark (default: a stub)")
+    parser.add_argument("--tolerance", type=float, default=0.4, help="allowed slowdown before failing")
+    parser.add_argument("--slack", type=float, default=2.0, help="extra allowed slowdown in ms, for tiny timings")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="fail when there is no comparable baseline (for CI)")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    args = parser.parse_args(argv)
+    groups = args.groups or GROUPS
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown benchmark group: {', '.join(sorted(unknown))}")
+    params = {k: getattr(args, k) for k in ("repeat", "local", "remote", "assets", "latency", "bandwidth", "jobs")}
+    work = tempfile.mkdtemp(prefix="asphalt-bench-")
+    os.environ["APPDATA"] = os.path.join(work, "appdata")
+    os.makedirs(os.environ["APPDATA"])
+    server, url = start_server(args)
+    os.environ["ASPHALT_MIRROR"] = url
+    try:
+        sys.path.insert(0, ROOT)
+        import main as launcher
+        ctx = {"work": work, "local_dir": os.path.join(work, "local"), "version": "bench-0"}
+        make_minecraft_tree(ctx["local_dir"], args.local)
+        results = {}
+        for group in GROUPS:
+            if group in groups:
+                print(f"{group}...", file=sys.stderr)
+                results.update(globals()[f"bench_{group}"](launcher, ctx, args))
+    finally:
+        server.terminate()
+        server.wait()
+        if args.keep:
+            print(f"scratch directory: {work}", file=sys.stderr)
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        stored = {}
+    if not stored and not args.update:
+        print(f"no baseline at {args.baseline}, run with --update to record one", file=sys.stderr)
+    elif stored and stored.get("params") != params:
+        print(f"baseline was recorded with {stored.get('params')}, not comparing", file=sys.stderr)
+        stored = {}
+    elif stored and stored.get("host") != platform.node():
+        print(f"baseline was recorded on {stored.get('host')}, timings may not be comparable", file=sys.stderr)
+    failed = compare(results, stored.get("results", {}), args.tolerance, args.slack)
+    missing = [name for name in results if name not in stored.get("results", {})]
+    if args.update:
+        results = {**stored.get("results", {}), **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"host": platform.node(), "python": platform.python_version(), "cpus": os.cpu_count(),
+                       "params": params, "results": {k: round(v, 3) for k, v in sorted(results.items())}},
+                      f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if args.require_baseline and missing:
+        print(f"\nNO BASELINE: {', '.join(missing)} (record one on this runner with --update)", file=sys.stderr)
+        return 1
+    if failed:
+        print(f"\nPERFORMANCE REGRESSION: {', '.join(failed)} slower than baseline by more than "
+              f"{args.tolerance:.0%} + {args.slack:g} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
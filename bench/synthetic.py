@@ -0,0 +1,50 @@
+import json
+import os
+import stat
+from datetime import datetime, timedelta, timezone
+
+
+def synthetic_manifest(count, prefix="remote"):
+    released = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    kinds = ("release", "release", "snapshot", "old_beta", "old_alpha")
+    versions = [{"id": f"{prefix}-{n}", "type": kinds[n % len(kinds)],
+                 "url": f"https://piston-meta.mojang.com/v1/packages/{prefix}-{n}.json",
+                 "releaseTime": (released - timedelta(hours=n)).isoformat()} for n in range(count)]
+    return {"latest": {"release": versions[0]["id"] if versions else None}, "versions": versions}
+
+
+def make_minecraft_tree(mc_dir, count, prefix="local", modded_every=4):
+    versions_dir = os.path.join(mc_dir, "versions")
+    ids = []
+    for n in range(count):
+        version_id = f"{prefix}-{n}"
+        data = {"id": version_id, "type": "release", "mainClass": "net.minecraft.client.main.Main"}
+        if modded_every and n % modded_every == modded_every - 1 and ids:
+            data = {"id": version_id, "inheritsFrom": ids[0], "type": "release",
+                    "mainClass": "net.fabricmc.loader.impl.launch.knot.KnotClient"}
+        os.makedirs(os.path.join(versions_dir, version_id), exist_ok=True)
+        with open(os.path.join(versions_dir, version_id, f"{version_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        ids.append(version_id)
+    return ids
+
+
+FAKE_JAVA = """#!/bin/sh
+case "$*" in
+    *-XshowSettings:properties*)
+        printf 'Property settings:\\n    java.version = {version}\\n    java.vendor = Bench\\n    os.arch = amd64\\n' >&2 ;;
+    *)
+        echo "[Render thread/INFO]: Sound engine started" ;;
+esac
+"""
+
+
+def make_fake_java(root, version="17.0.8"):
+    if os.name == "nt":
+        return None
+    path = os.path.join(root, "jdk-bench", "bin", "java")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(FAKE_JAVA.format(version=version))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
@@ -1,557 +1,3323 @@
-import json
-import os
-import shutil
-import subprocess
-import sys
-import uuid
-from datetime import datetime
-
-import psutil
-import minecraft_launcher_lib
-
-from PySide6.QtCore import QObject, Qt, QThread, Signal
-from PySide6.QtWidgets import (
-    QApplication, QComboBox, QDialog, QDialogButtonBox, QFileDialog, QFrame,
-    QGridLayout, QHBoxLayout, QLabel, QLineEdit, QMessageBox,
-    QProgressBar, QPushButton, QSlider, QSpinBox, QTextEdit,
-    QVBoxLayout, QWidget
-)
-from PySide6.QtGui import QIcon, QPainter, QPixmap
-
-
-class BackgroundWidget(QWidget):
-    def __init__(self, pixmap, parent=None):
-        super().__init__(parent)
-        self.pixmap = pixmap
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform)
-        painter.drawPixmap(self.rect(), self.pixmap)
-
-
-def get_appdata_path():
-    return os.path.join(os.getenv("APPDATA"), "AsphaltLauncher")
-
-
-def resource_path(relative_path):
-    base_path = getattr(sys, '_MEIPASS', os.path.dirname(__file__))
-    return os.path.join(base_path, relative_path)
-
-
-def get_minecraft_dir():
-    return os.path.expandvars(r"%APPDATA%\.minecraft")
-
-
-CONFIG_FILE = os.path.join(get_appdata_path(), "launcher.json")
-
-
-def load_config():
-    if os.path.isfile(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {"username": "", "jvm_args": ["-Xms2G", "-Xmx4G"], "java_path": None}
-
-
-def save_config(username, jvm_args, java_path):
-    os.makedirs(get_appdata_path(), exist_ok=True)
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump({"username": username, "jvm_args": jvm_args, "java_path": java_path}, f, indent=2)
-
-
-LAST_PLAYED_FILE = os.path.join(get_appdata_path(), "last_played.json")
-
-
-def load_last_played():
-    if os.path.isfile(LAST_PLAYED_FILE):
-        try:
-            with open(LAST_PLAYED_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {}
-
-
-def save_last_played(version_id):
-    lp = load_last_played()
-    lp[version_id] = datetime.now().timestamp()
-    with open(LAST_PLAYED_FILE, "w", encoding="utf-8") as f:
-        json.dump(lp, f, indent=2)
-
-
-def _scan_local_versions():
-    local = {}
-    versions_dir = os.path.join(get_minecraft_dir(), "versions")
-    if os.path.isdir(versions_dir):
-        for name in os.listdir(versions_dir):
-            folder = os.path.join(versions_dir, name)
-            if os.path.isdir(folder):
-                local[name] = os.path.getmtime(folder)
-    return local
-
-
-def get_available_versions():
-    local = _scan_local_versions()
-    local_items = [(f"🔧 {v}", v) for v in local]
-    remote = minecraft_launcher_lib.utils.get_version_list()
-    type_labels = {"release": "Release", "snapshot": "Snapshot", "old_beta": "Beta", "old_alpha": "Alpha"}
-    seen = set(local)
-    remote_items = []
-    for v in remote:
-        vid = v["id"]
-        if vid in seen:
-            continue
-        seen.add(vid)
-        label = f"{type_labels.get(v['type'], v['type'])} - {vid}"
-        remote_items.append((label, vid))
-    items = local_items + remote_items
-    last_played = load_last_played()
-    if last_played:
-        last_vid = max(last_played, key=last_played.get)
-        idx = next((i for i, (_, vid) in enumerate(items) if vid == last_vid), None)
-        if idx is not None:
-            items.insert(0, items.pop(idx))
-    return items
-
-
-def launch_minecraft(username, version, java_executable=None, jvm_args=None):
-    offline_uuid = str(uuid.uuid3(uuid.NAMESPACE_OID, username))
-    options = {"username": username, "uuid": offline_uuid, "token": "0" * 32}
-    if java_executable:
-        options["executablePath"] = java_executable
-    if jvm_args:
-        options["jvmArguments"] = jvm_args
-    mc_dir = get_minecraft_dir()
-    minecraft_launcher_lib.install.install_minecraft_version(version, mc_dir, callback=None)
-    command = minecraft_launcher_lib.command.get_minecraft_command(version, mc_dir, options)
-    proc = subprocess.Popen(
-        command,
-        creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
-        cwd=os.path.expandvars(r"%APPDATA%\.minecraft")
-    )
-    save_last_played(version)
-    proc.wait()
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-        try:
-            if proc.info['pid'] != os.getpid():
-                if "asphalt-launcher" in ' '.join(proc.info['cmdline']).lower():
-                    proc.terminate()
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
-
-
-class JvmArgsDialog(QDialog):
-    def __init__(self, parent=None, current=None):
-        super().__init__(parent)
-        self.setWindowTitle("Custom JVM Arguments")
-        self.setFixedSize(500, 300)
-        layout = QVBoxLayout(self)
-        self.text = QTextEdit()
-        self.text.setPlainText("\n".join(current or []))
-        layout.addWidget(self.text)
-        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        btns.accepted.connect(self.accept)
-        btns.rejected.connect(self.reject)
-        layout.addWidget(btns)
-
-    def args(self):
-        txt = self.text.toPlainText().strip()
-        return txt.splitlines() if txt else []
-
-
-class JavaPickerDialog(QDialog):
-    def __init__(self, parent=None, current=""):
-        super().__init__(parent)
-        self.setWindowTitle("Select Java Executable")
-        self.setFixedSize(400, 100)
-        layout = QVBoxLayout(self)
-        self.path = QLineEdit(current or "")
-        browse = QPushButton("Browse...")
-        browse.clicked.connect(self._browse)
-        row = QHBoxLayout()
-        row.addWidget(self.path)
-        row.addWidget(browse)
-        layout.addLayout(row)
-        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        btns.accepted.connect(self.accept)
-        btns.rejected.connect(self.reject)
-        layout.addWidget(btns)
-
-    def _browse(self):
-        file, _ = QFileDialog.getOpenFileName(
-            self, "Select Java executable", "", "Executables (*.exe)" if os.name == 'nt' else "")
-        if file:
-            self.path.setText(file)
-
-    def java_path(self):
-        path = self.path.text().strip()
-        if path and ("java" in path.lower() or "javaw" in path.lower()):
-            return path
-        return None
-
-
-class InstallWorker(QObject):
-    progress_max = Signal(int)
-    progress = Signal(int)
-    finished = Signal()
-    failed = Signal(str)
-
-    def __init__(self, version_id, mc_dir):
-        super().__init__()
-        self.version_id = version_id
-        self.mc_dir = mc_dir
-
-    def run(self):
-        try:
-            def cb_max(v): self.progress_max.emit(v)
-            def cb_prog(v): self.progress.emit(v)
-            minecraft_launcher_lib.install.install_minecraft_version(
-                self.version_id, self.mc_dir,
-                callback={"setMax": cb_max, "setProgress": cb_prog, "setStatus": lambda _: None}
-            )
-            self.finished.emit()
-        except Exception as e:
-            self.failed.emit(str(e))
-
-
-class AsphaltLauncher(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.appdata_dir = get_appdata_path()
-        self.assets_dir = os.path.join(self.appdata_dir, "assets")
-        self.icon_path = os.path.join(self.assets_dir, "logo.ico")
-        self.ensure_assets_exist()
-        self.cfg = load_config()
-        self.java_executable = self.cfg.get("java_path")
-        self.jvm_arguments = self.cfg.get("jvm_args", ["-Xms2G", "-Xmx4G"])
-        self.setWindowTitle("Asphalt Launcher")
-        self.setFixedSize(880, 520)
-        self.setWindowIcon(QIcon(self.icon_path))
-        bg_path = os.path.join(self.assets_dir, "background.webp")
-        if os.path.isfile(bg_path):
-            bg_pixmap = QPixmap(bg_path)
-            bg = BackgroundWidget(bg_pixmap, self)
-            bg.setGeometry(self.rect())
-            bg.lower()
-        else:
-            self.setStyleSheet("background-color: #2c2c2c; color: white; font-family: 'Segoe UI';")
-        root_v = QVBoxLayout(self)
-        root_v.setContentsMargins(0, 0, 0, 0)
-        top_bar = QHBoxLayout()
-        top_bar.setContentsMargins(16, 12, 16, 8)
-        username_label = QLabel("Username:")
-        username_label.setStyleSheet("color:#fff; font-size:12px; font-weight:bold;")
-        top_bar.addWidget(username_label)
-        self.username_input = QLineEdit()
-        self.username_input.setPlaceholderText("Enter your Minecraft username")
-        self.username_input.setText(self.cfg.get("username", ""))
-        self.username_input.setFixedWidth(300)
-        top_bar.addWidget(self.username_input)
-        top_bar.addStretch()
-        self.btn_settings = QPushButton("⚙")
-        self.btn_settings.setStyleSheet("background-color:#888; padding:6px 12px; font-size:12px;")
-        self.btn_settings.clicked.connect(self.open_settings)
-        top_bar.addWidget(self.btn_settings)
-        self.username_input.setFixedHeight(self.btn_settings.sizeHint().height())
-        root_v.addLayout(top_bar)
-        root_v.addStretch()
-        center_h = QHBoxLayout()
-        center_h.addStretch()
-        center_v = QVBoxLayout()
-        center_v.setAlignment(Qt.AlignCenter)
-        self.version_dropdown = QComboBox()
-        self.version_map = {}
-        self._online = True
-        self.version_dropdown.setFixedWidth(280)
-        self.version_dropdown.setFixedHeight(42)
-        self.retry_btn = QPushButton("⟳")
-        self.retry_btn.setFixedSize(28, 42)
-        self.retry_btn.setToolTip("Refresh version list")
-        self.retry_btn.clicked.connect(self._populate_dropdown)
-        self.retry_btn.hide()
-        try:
-            versions = get_available_versions()
-            self.retry_btn.hide()
-        except Exception:
-            versions = [(f"🔧 {v}", v) for v in _scan_local_versions()]
-            self.retry_btn.show()
-        most_recent_index = 0
-        for idx, (label, version_id) in enumerate(versions):
-            self.version_dropdown.addItem(label)
-            self.version_map[label] = version_id
-            if label.startswith("🔧") and most_recent_index == 0:
-                most_recent_index = idx
-        self.version_dropdown.setCurrentIndex(most_recent_index)
-        last = load_last_played()
-        if last:
-            last_vid = max(last, key=last.get)
-            idx = next((i for i, (_, vid) in enumerate(versions) if vid == last_vid), 0)
-            self.version_dropdown.setCurrentIndex(idx)
-        self.start_btn = QPushButton("START")
-        self.start_btn.setFixedSize(180, 42)
-        self.start_btn.setStyleSheet("background-color:#6ab04c; font-size:17px; font-weight:bold;")
-        self.start_btn.clicked.connect(self.launch_game)
-        row = QHBoxLayout()
-        row.addWidget(self.version_dropdown)
-        row.addWidget(self.retry_btn)
-        row.addSpacing(12)
-        row.addWidget(self.start_btn)
-        center_v.addLayout(row)
-        center_h.addLayout(center_v)
-        center_h.addStretch()
-        root_v.addLayout(center_h)
-        root_v.addStretch()
-        self._populate_dropdown()
-        from PySide6.QtCore import QTimer
-        self._network_timer = QTimer(self)
-        self._network_timer.setInterval(3000)
-        self._network_timer.timeout.connect(self._check_network)
-        self._network_timer.start()
-        footer = QLabel("Asphalt Launcher - A Launcher for Minecraft")
-        footer.setAlignment(Qt.AlignCenter)
-        footer.setStyleSheet("color:#fff; font-size:12px; font-weight:bold;")
-        root_v.addWidget(footer)
-
-    def open_settings(self):
-        SettingsDialog(self, self.java_executable, self.jvm_arguments).exec()
-
-    def edit_jvm_args(self):
-        dlg = JvmArgsDialog(self, self.jvm_arguments)
-        if dlg.exec():
-            self.jvm_arguments = dlg.args()
-            save_config(self.username_input.text(), self.jvm_arguments, self.java_executable)
-
-    def select_java(self):
-        dlg = JavaPickerDialog(self, self.java_executable or "")
-        if dlg.exec():
-            self.java_executable = dlg.java_path()
-            save_config(self.username_input.text(), self.jvm_arguments, self.java_executable)
-
-    def open_folder(self, path):
-        if os.path.isdir(path):
-            os.startfile(path)
-
-    def _populate_dropdown(self):
-        old_text = self.version_dropdown.currentText()
-        self.version_dropdown.clear()
-        self.version_map.clear()
-        if self._online:
-            try:
-                items = get_available_versions()
-                self.retry_btn.hide()
-            except Exception:
-                self._online = False
-        if not self._online:
-            local_versions = _scan_local_versions()
-            if not local_versions:
-                self.version_dropdown.addItem("No versions found (offline)")
-                QMessageBox.warning(
-                    self, "Offline",
-                    "No local Minecraft versions found and you appear to be offline.\n"
-                    "Connect to the internet or place a version manually in .minecraft\\versions"
-                )
-            else:
-                for v in local_versions:
-                    self.version_dropdown.addItem(f"🔧 {v}")
-            self.retry_btn.show()
-            return
-        for label, vid in items:
-            self.version_dropdown.addItem(label)
-            self.version_map[label] = vid
-        idx = self.version_dropdown.findText(old_text)
-        if idx != -1:
-            self.version_dropdown.setCurrentIndex(idx)
-
-    def _check_network(self):
-        import socket
-        new_state = True
-        try:
-            socket.create_connection(("launchermeta.mojang.com", 443), timeout=1)
-        except Exception:
-            new_state = False
-        if new_state != self._online:
-            self._online = new_state
-            from PySide6.QtCore import QTimer
-            QTimer.singleShot(0, self._populate_dropdown)
-
-    def launch_game(self):
-        self._populate_dropdown()
-        self._online = None
-        username = self.username_input.text().strip()
-        selected_label = self.version_dropdown.currentText()
-        version_id = self.version_map.get(selected_label)
-        if not username:
-            dlg = QDialog(self)
-            dlg.setWindowTitle("Attention")
-            dlg.setFixedSize(300, 80)
-            dlg.setModal(True)
-            lay = QVBoxLayout(dlg)
-            lay.addWidget(QLabel("Username is required to launch Minecraft"), alignment=Qt.AlignCenter)
-            ok = QPushButton("OK")
-            ok.clicked.connect(dlg.accept)
-            lay.addWidget(ok, alignment=Qt.AlignCenter)
-            dlg.exec()
-            return
-        save_config(username, self.jvm_arguments, self.java_executable)
-        mc_dir = get_minecraft_dir()
-        version_dir = os.path.join(mc_dir, "versions", version_id)
-        json_file = os.path.join(version_dir, f"{version_id}.json")
-        jar_file = os.path.join(version_dir, f"{version_id}.jar")
-        already_installed = os.path.isfile(json_file) and os.path.isfile(jar_file)
-        if not already_installed:
-            from PySide6.QtCore import QThread
-            from PySide6.QtWidgets import QMessageBox
-            progress = QDialog(self)
-            progress.setWindowTitle("Downloading…")
-            progress.setFixedSize(300, 100)
-            progress.setModal(True)
-            layout = QVBoxLayout(progress)
-            bar = QProgressBar()
-            layout.addWidget(QLabel("Minecraft will launch after installation."), alignment=Qt.AlignCenter)
-            layout.addWidget(bar)
-            self.thread = QThread()
-            self.worker = InstallWorker(version_id, mc_dir)
-            self.worker.moveToThread(self.thread)
-            self.thread.started.connect(self.worker.run)
-            self.worker.progress_max.connect(bar.setMaximum)
-            self.worker.progress.connect(bar.setValue)
-            self.worker.finished.connect(progress.accept)
-            self.worker.failed.connect(lambda msg: (progress.reject(), QMessageBox.critical(self, "Download Failed", msg)))
-            self.worker.finished.connect(self.thread.quit)
-            self.worker.finished.connect(self.worker.deleteLater)
-            self.thread.finished.connect(self.thread.deleteLater)
-            self.thread.start()
-            progress.exec()
-            if progress.result() != QDialog.Accepted:
-                return
-        self.hide()
-        try:
-            launch_minecraft(username, version_id,
-                             java_executable=self.java_executable,
-                             jvm_args=self.jvm_arguments)
-        except Exception as e:
-            print(f"Launch failed: {e}")
-        finally:
-            self.show()
-
-    def ensure_assets_exist(self):
-        os.makedirs(self.assets_dir, exist_ok=True)
-        for asset in ("logo.ico", "background.webp"):
-            dst = os.path.join(self.assets_dir, asset)
-            if not os.path.exists(dst):
-                src = resource_path(f"assets/{asset}")
-                if os.path.exists(src):
-                    shutil.copy(src, dst)
-
-
-class SettingsDialog(QDialog):
-    def __init__(self, parent, java_executable, jvm_arguments):
-        super().__init__(parent)
-        self.setWindowTitle("Settings")
-        self.setFixedSize(380, 240)
-        self.setModal(True)
-        self.parent_window = parent
-        self.jvm_arguments = list(jvm_arguments or [])
-        self.min_spin = QSpinBox()
-        self.min_spin.setRange(512, 64 * 1024)
-        self.min_spin.setSingleStep(256)
-        self.min_spin.setValue(2048)
-        self.max_spin = QSpinBox()
-        self.max_spin.setRange(512, 64 * 1024)
-        self.max_spin.setSingleStep(256)
-        self.max_spin.setValue(4096)
-        self.min_slider = QSlider(Qt.Horizontal)
-        self.min_slider.setRange(512, 64 * 1024)
-        self.min_slider.setSingleStep(256)
-        self.min_slider.setPageStep(1024)
-        self.min_slider.setValue(2048)
-        self.max_slider = QSlider(Qt.Horizontal)
-        self.max_slider.setRange(512, 64 * 1024)
-        self.max_slider.setSingleStep(256)
-        self.max_slider.setPageStep(1024)
-        self.max_slider.setValue(4096)
-        self.min_spin.valueChanged.connect(self.min_slider.setValue)
-        self.min_slider.valueChanged.connect(self.min_spin.setValue)
-        self.max_spin.valueChanged.connect(self.max_slider.setValue)
-        self.max_slider.valueChanged.connect(self.max_spin.setValue)
-        self.min_spin.valueChanged.connect(self._write_ram_to_args)
-        self.max_spin.valueChanged.connect(self._write_ram_to_args)
-        self._load_ram_from_args()
-        grid = QGridLayout()
-        grid.addWidget(QLabel("Min RAM (MB):"), 0, 0)
-        grid.addWidget(self.min_slider, 0, 1)
-        grid.addWidget(self.min_spin, 0, 2)
-        grid.addWidget(QLabel("Max RAM (MB):"), 1, 0)
-        grid.addWidget(self.max_slider, 1, 1)
-        grid.addWidget(self.max_spin, 1, 2)
-        btn_jvm = QPushButton("Custom JVM Args")
-        btn_java = QPushButton("Select JRE")
-        btn_mc = QPushButton(".minecraft")
-        btn_launcher = QPushButton("Launcher Dir")
-        for btn in (btn_jvm, btn_java, btn_mc, btn_launcher):
-            btn.setStyleSheet("background-color: #888888; padding: 8px; font-size: 12px;")
-        btn_grid = QGridLayout()
-        btn_grid.addWidget(btn_jvm, 0, 0)
-        btn_grid.addWidget(btn_java, 0, 1)
-        btn_grid.addWidget(btn_mc, 1, 0)
-        btn_grid.addWidget(btn_launcher, 1, 1)
-        close_btn = QPushButton("Close")
-        close_btn.setStyleSheet("background-color: #888888; padding: 8px; font-size: 12px;")
-        close_btn.clicked.connect(self.accept)
-        main = QVBoxLayout(self)
-        main.addLayout(grid)
-        main.addLayout(btn_grid)
-        main.addWidget(close_btn)
-        btn_jvm.clicked.connect(self._open_jvm_dialog)
-        btn_java.clicked.connect(self._open_java_dialog)
-        btn_mc.clicked.connect(lambda: self.parent_window.open_folder(get_minecraft_dir()))
-        btn_launcher.clicked.connect(lambda: self.parent_window.open_folder(self.parent_window.appdata_dir))
-
-    def _load_ram_from_args(self):
-        for arg in self.jvm_arguments:
-            if arg.startswith("-Xms"):
-                mb = int(arg[4:-1]) if arg.endswith("M") else int(arg[4:-1]) * 1024
-                self.min_spin.setValue(mb)
-                self.min_slider.setValue(mb)
-            elif arg.startswith("-Xmx"):
-                mb = int(arg[4:-1]) if arg.endswith("M") else int(arg[4:-1]) * 1024
-                self.max_spin.setValue(mb)
-                self.max_slider.setValue(mb)
-
-    def _write_ram_to_args(self):
-        new_args = [a for a in self.jvm_arguments if not (a.startswith("-Xms") or a.startswith("-Xmx"))]
-        new_args.append(f"-Xms{self.min_spin.value()}M")
-        new_args.append(f"-Xmx{self.max_spin.value()}M")
-        self.jvm_arguments = new_args
-        self.parent_window.jvm_arguments = new_args
-        save_config(self.parent_window.username_input.text(),
-                    self.parent_window.jvm_arguments,
-                    self.parent_window.java_executable)
-
-    def _open_jvm_dialog(self):
-        dlg = JvmArgsDialog(self, self.jvm_arguments)
-        if dlg.exec():
-            self.jvm_arguments = dlg.args()
-            self.parent_window.jvm_arguments = self.jvm_arguments
-            save_config(self.parent_window.username_input.text(),
-                        self.parent_window.jvm_arguments,
-                        self.parent_window.java_executable)
-            self._load_ram_from_args()
-
-    def _open_java_dialog(self):
-        dlg = JavaPickerDialog(self, self.parent_window.java_executable or "")
-        if dlg.exec():
-            self.parent_window.java_executable = dlg.java_path()
-            save_config(self.parent_window.username_input.text(),
-                        self.parent_window.jvm_arguments,
-                        self.parent_window.java_executable)
-
-
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    launcher = AsphaltLauncher()
-    launcher.show()
-    sys.exit(app.exec())
+import argparse
+import atexit
+import hashlib
+import html
+import http.client
+import http.server
+import json
+import logging.handlers
+import os
+import platform
+import re
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+import zipfile
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from datetime import datetime
+
+_STARTUP_T0 = time.perf_counter()
+
+from PySide6.QtCore import (
+    QAbstractListModel, QEvent, QFileSystemWatcher, QModelIndex, QObject, QSortFilterProxyModel, Qt,
+    QThread, QTimer, Signal
+)
+
+
+def get_appdata_path():
+    return os.path.join(os.getenv("APPDATA"), "AsphaltLauncher")
+
+
+def resource_path(relative_path):
+    base_path = getattr(sys, '_MEIPASS', os.path.dirname(__file__))
+    return os.path.join(base_path, relative_path)
+
+
+def get_minecraft_dir(instance=None):
+    if instance is None:
+        instance = STATE.config("instance")
+    if not instance:
+        return os.path.expandvars(r"%APPDATA%\.minecraft")
+    return os.path.join(get_appdata_path(), "instances", instance)
+
+
+def list_instances():
+    try:
+        return sorted(e.name for e in os.scandir(os.path.join(get_appdata_path(), "instances")) if e.is_dir())
+    except OSError:
+        return []
+
+
+def _dir_key(path):
+    return hashlib.sha1(os.path.normcase(os.path.abspath(path)).encode("utf-8")).hexdigest()[:16]
+
+
+def _write_json_atomic(path, data, indent=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+
+CONFIG_FILE = os.path.join(get_appdata_path(), "launcher.json")
+LAST_PLAYED_FILE = os.path.join(get_appdata_path(), "last_played.json")
+DEFAULT_CONFIG = {"username": "", "jvm_args": [], "jvm_profile": "balanced", "java_path": None, "java_overrides": {},
+                  "class_data_sharing": True, "mirror": "", "prefetch": False, "prefetch_rate": 2 << 20,
+                  "prefetch_jobs": 2}
+
+
+class StateStore:
+    def __init__(self, config_file=CONFIG_FILE, last_played_file=LAST_PLAYED_FILE, delay=0.5, max_delay=5.0):
+        self.delay = delay
+        self.max_delay = max_delay
+        self._files = {"config": config_file, "last_played": last_played_file}
+        self._data = {
+            "config": {**DEFAULT_CONFIG, **self._load(config_file)},
+            "last_played": self._load(last_played_file),
+        }
+        self._dirty = set()
+        self._timer = None
+        self._dirty_since = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def config(self, key, default=None):
+        with self._lock:
+            value = self._data["config"].get(key, default)
+        if isinstance(value, (list, dict)):
+            return type(value)(value)
+        return value
+
+    def update_config(self, **values):
+        with self._lock:
+            cfg = self._data["config"]
+            if all(cfg.get(k) == v for k, v in values.items()):
+                return
+            cfg.update(values)
+            self._mark("config")
+
+    def last_played(self):
+        with self._lock:
+            return dict(self._data["last_played"])
+
+    def mark_played(self, version_id):
+        with self._lock:
+            self._data["last_played"][version_id] = datetime.now().timestamp()
+            self._mark("last_played")
+
+    def _mark(self, section):
+        self._dirty.add(section)
+        now = time.monotonic()
+        if self._timer is not None:
+            if now - self._dirty_since >= self.max_delay:
+                return
+            self._timer.cancel()
+        else:
+            self._dirty_since = now
+        self._timer = threading.Timer(min(self.delay, self._dirty_since + self.max_delay - now), self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending = {section: json.loads(json.dumps(self._data[section])) for section in self._dirty}
+                self._dirty.clear()
+            for section, data in pending.items():
+                _write_json_atomic(self._files[section], data, indent=2)
+
+
+STATE = StateStore()
+atexit.register(STATE.flush)
+
+
+TRACE_HISTORY_FILE = os.path.join(get_appdata_path(), "trace_history.jsonl")
+TRACE_HISTORY_KEEP = 500
+TRACE_MAX_SPANS = 20000
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter(), self.cat, self.args)
+
+
+class Tracer:
+    def __init__(self, max_spans=TRACE_MAX_SPANS, origin=_STARTUP_T0):
+        self.spans = deque(maxlen=max_spans)
+        self.threads = {}
+        self.origin = origin
+
+    def span(self, name, cat="launcher", **args):
+        return _Span(self, name, cat, args)
+
+    def record(self, name, start, end, cat="launcher", args=None):
+        tid = threading.get_ident()
+        if tid not in self.threads:
+            self.threads[tid] = threading.current_thread().name
+        self.spans.append((name, cat, start, end, tid, args))
+
+    def since(self, start, cats=None):
+        return [s for s in list(self.spans) if s[2] >= start and (cats is None or s[1] in cats)]
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in list(self.threads.items())]
+        for name, cat, start, end, tid, args in list(self.spans):
+            events.append({"name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                           "ts": round((start - self.origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1),
+                           "args": args or {}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path):
+        _write_json_atomic(os.path.abspath(path), self.chrome_trace())
+
+
+TRACER = Tracer()
+
+
+def record_trace_history(kind, spans, path=TRACE_HISTORY_FILE, **info):
+    phases = {}
+    for name, cat, start, end, tid, args in spans:
+        phases[name] = phases.get(name, 0.0) + (end - start) * 1000
+    entry = {"time": time.time(), "kind": kind, "host": platform.node(), **info,
+             "phases": {name: round(ms, 2) for name, ms in phases.items()}}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        if os.path.getsize(path) > TRACE_HISTORY_KEEP * 2048:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+            if len(lines) > TRACE_HISTORY_KEEP:
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.writelines(lines[-TRACE_HISTORY_KEEP:])
+                os.replace(tmp, path)
+    except OSError as e:
+        print(f"Could not write trace history: {e}")
+
+
+def summarize_trace_history(kind=None, path=TRACE_HISTORY_FILE):
+    samples = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if kind is None or entry.get("kind") == kind:
+                    for name, ms in entry.get("phases", {}).items():
+                        samples.setdefault(name, []).append(ms)
+    except OSError:
+        return {}
+    summary = {}
+    for name, values in samples.items():
+        values.sort()
+        summary[name] = {"count": len(values), "median": values[(len(values) - 1) // 2],
+                         "p95": values[min(int(len(values) * 0.95), len(values) - 1)], "max": values[-1]}
+    return summary
+
+
+MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+MANIFEST_CACHE_FILE = os.path.join(get_appdata_path(), "version_manifest.json")
+MANIFEST_TTL = 6 * 60 * 60
+USER_AGENT = "AsphaltLauncher"
+
+
+def mirror_base():
+    return os.getenv("ASPHALT_MIRROR") or STATE.config("mirror") or None
+
+
+def mirror_url(url, mirror=None):
+    mirror = mirror_base() if mirror is None else mirror
+    if not mirror:
+        return url
+    parts = urllib.parse.urlsplit(url)
+    rest = parts.path + (f"?{parts.query}" if parts.query else "")
+    if isinstance(mirror, dict):
+        base = mirror.get(parts.netloc)
+        return f"{base.rstrip('/')}{rest}" if base else url
+    return f"{mirror.rstrip('/')}/{parts.netloc}{rest}"
+
+
+def load_manifest_cache():
+    if os.path.isfile(MANIFEST_CACHE_FILE):
+        try:
+            with open(MANIFEST_CACHE_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+
+def manifest_is_stale(cache):
+    return not cache.get("versions") or time.time() - cache.get("fetched", 0) > MANIFEST_TTL
+
+
+def refresh_manifest_cache(url=None, timeout=10):
+    url = url or mirror_url(MANIFEST_URL)
+    cache = load_manifest_cache()
+    headers = {"User-Agent": USER_AGENT}
+    if cache.get("versions") and cache.get("url") == url:
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as r:
+            data = json.load(r)
+            cache = {
+                "url": url,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "latest": data.get("latest", {}),
+                "versions": data["versions"],
+            }
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            raise
+    cache["fetched"] = time.time()
+    _write_json_atomic(MANIFEST_CACHE_FILE, cache)
+    return cache
+
+
+LOCAL_INDEX_DIR = os.path.join(get_appdata_path(), "local_versions")
+
+
+class LocalVersionIndex:
+    def __init__(self, mc_dir, index_file=None):
+        self.versions_dir = os.path.abspath(os.path.join(mc_dir, "versions"))
+        self.index_file = index_file or os.path.join(LOCAL_INDEX_DIR, f"{_dir_key(mc_dir)}.json")
+        self.versions = {}
+        self.watched = False
+        self._dir_mtime = None
+        self._lock = threading.RLock()
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("versions_dir") == self.versions_dir:
+                self.versions = data["versions"]
+                self._dir_mtime = data["dir_mtime"]
+        except Exception:
+            pass
+
+    def refresh(self):
+        if self.watched:
+            return False
+        try:
+            mtime = os.stat(self.versions_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._dir_mtime:
+            return False
+        return self.rescan()
+
+    def rescan(self):
+        with self._lock:
+            found = {}
+            try:
+                self._dir_mtime = os.stat(self.versions_dir).st_mtime_ns
+                with os.scandir(self.versions_dir) as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            found[entry.name] = self._entry(entry.name, entry.stat().st_mtime_ns)
+            except OSError:
+                self._dir_mtime = None
+            changed = found != self.versions
+            self.versions = found
+            if changed:
+                self._save()
+            return changed
+
+    def update(self, name):
+        with self._lock:
+            try:
+                entry = self._entry(name, os.stat(os.path.join(self.versions_dir, name)).st_mtime_ns)
+            except OSError:
+                entry = None
+            if entry == self.versions.get(name):
+                return False
+            if entry is None:
+                del self.versions[name]
+            else:
+                self.versions[name] = entry
+            self._save()
+            return True
+
+    def _entry(self, name, dir_mtime):
+        old = self.versions.get(name)
+        if old is not None and old["dir_mtime"] == dir_mtime:
+            return old
+        entry = {"dir_mtime": dir_mtime, "mtime": dir_mtime / 1e9, "type": None, "inheritsFrom": None}
+        json_path = os.path.join(self.versions_dir, name, f"{name}.json")
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entry.update(mtime=os.path.getmtime(json_path), type=data.get("type"), inheritsFrom=data.get("inheritsFrom"))
+        except Exception:
+            pass
+        return entry
+
+    def _save(self):
+        try:
+            _write_json_atomic(self.index_file, {
+                "versions_dir": self.versions_dir, "dir_mtime": self._dir_mtime, "versions": self.versions})
+        except OSError:
+            pass
+
+
+_local_indexes = {}
+
+
+def get_local_index(mc_dir=None):
+    mc_dir = os.path.abspath(mc_dir or get_minecraft_dir())
+    if mc_dir not in _local_indexes:
+        _local_indexes[mc_dir] = LocalVersionIndex(mc_dir)
+    return _local_indexes[mc_dir]
+
+
+def _scan_local_versions(mc_dir=None):
+    index = get_local_index(mc_dir)
+    with index._lock:
+        index.refresh()
+        return {name: entry["mtime"] for name, entry in index.versions.items()}
+
+
+def get_available_versions(manifest=None, mc_dir=None):
+    if manifest is None:
+        manifest = load_manifest_cache()
+        if manifest_is_stale(manifest):
+            manifest = refresh_manifest_cache()
+    local = _scan_local_versions(mc_dir)
+    local_types = {name: entry.get("type") for name, entry in get_local_index(mc_dir).versions.items()}
+    items = [{"id": v, "label": f"🔧 {v}", "type": local_types.get(v), "local": True, "rank": 1e11 - mtime}
+             for v, mtime in local.items()]
+    type_labels = {"release": "Release", "snapshot": "Snapshot", "old_beta": "Beta", "old_alpha": "Alpha"}
+    seen = set(local)
+    for v in manifest.get("versions", []):
+        vid = v["id"]
+        if vid in seen:
+            continue
+        seen.add(vid)
+        label = f"{type_labels.get(v['type'], v['type'])} - {vid}"
+        try:
+            released = datetime.fromisoformat(v["releaseTime"]).timestamp()
+        except (KeyError, ValueError):
+            released = 0
+        items.append({"id": vid, "label": label, "type": v["type"], "local": False, "rank": 2e11 - released})
+    last_played = STATE.last_played()
+    if last_played:
+        last_vid = max(last_played, key=last_played.get)
+        for item in items:
+            if item["id"] == last_vid:
+                item["rank"] = -last_played[last_vid]
+    items.sort(key=lambda item: item["rank"])
+    return items
+
+
+JAVA_RUNTIME_MANIFEST_URL = (
+    "https://launchermeta.mojang.com/v1/products/java-runtime/"
+    "2ec0cc96c44e5a76b9c8b7c39df7210883d12871/all.json"
+)
+LIBRARIES_URL = "https://libraries.minecraft.net/"
+RESOURCES_URL = "https://resources.download.minecraft.net/"
+
+DownloadTask = namedtuple("DownloadTask", "url path sha1 size executable", defaults=(None, None, False))
+
+
+class DownloadError(Exception):
+    pass
+
+
+class InstallCancelled(DownloadError):
+    pass
+
+
+def _os_name():
+    return {"Windows": "windows", "Darwin": "osx"}.get(platform.system(), "linux")
+
+
+def _jvm_platform():
+    system = platform.system()
+    is_32 = platform.architecture()[0] == "32bit"
+    if system == "Windows":
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            return "windows-arm64"
+        return "windows-x86" if is_32 else "windows-x64"
+    if system == "Darwin":
+        return "mac-os-arm64" if platform.machine() == "arm64" else "mac-os"
+    return "linux-i386" if is_32 else "linux"
+
+
+def _rules_allow(rules):
+    if not rules:
+        return True
+    allowed = False
+    for rule in rules:
+        if rule.get("features"):
+            continue
+        os_rule = rule.get("os", {})
+        if "name" in os_rule and os_rule["name"] != _os_name():
+            continue
+        if "arch" in os_rule and os_rule["arch"] == "x86" and platform.architecture()[0] != "32bit":
+            continue
+        allowed = rule["action"] == "allow"
+    return allowed
+
+
+def _library_path(name):
+    name, _, ext = name.partition("@")
+    group, artifact, version, *classifier = name.split(":")
+    filename = "-".join([artifact, version] + classifier) + "." + (ext or "jar")
+    return "/".join(group.split(".") + [artifact, version, filename])
+
+
+def _sha1_file(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+STORE_DIR = os.path.join(get_appdata_path(), "store")
+
+
+class ObjectStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+
+    def path(self, sha1):
+        return os.path.join(self.root, "objects", sha1[:2], sha1)
+
+    def put(self, src, sha1):
+        dst = self.path(sha1)
+        if os.path.isfile(dst):
+            os.remove(src)
+            return dst
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.replace(src, dst)
+        except OSError:
+            tmp = f"{dst}.{threading.get_ident()}.tmp"
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dst)
+            os.remove(src)
+        return dst
+
+    def adopt(self, path, sha1):
+        dst = self.path(sha1)
+        if os.path.isfile(dst):
+            return
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.link(path, dst)
+        except OSError:
+            pass
+
+    def link(self, sha1, dest):
+        src = self.path(sha1)
+        if not os.path.isfile(src):
+            return False
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.{threading.get_ident()}.link"
+        try:
+            os.link(src, tmp)
+        except FileExistsError:
+            os.remove(tmp)
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+        return True
+
+    def refcount(self, sha1):
+        try:
+            return os.stat(self.path(sha1)).st_nlink - 1
+        except OSError:
+            return 0
+
+    def gc(self):
+        removed = freed = 0
+        objects = os.path.join(self.root, "objects")
+        if not os.path.isdir(objects):
+            return removed, freed
+        for bucket in os.scandir(objects):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if self.refcount(entry.name) > 0:
+                    continue
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                removed += 1
+                freed += size
+        return removed, freed
+
+
+def default_store():
+    return ObjectStore() if STATE.config("shared_store", True) else None
+
+
+def format_size(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def format_progress(info):
+    parts = []
+    if info.get("total_bytes"):
+        parts.append(f"{format_size(info['bytes'])} / {format_size(info['total_bytes'])}")
+    if info.get("total_files"):
+        parts.append(f"{info['files']}/{info['total_files']} files")
+    if info.get("rate"):
+        parts.append(f"{format_size(info['rate'])}/s")
+    if info.get("eta") is not None:
+        eta = int(info["eta"])
+        parts.append(f"ETA {eta // 60}:{eta % 60:02d}")
+    return " - ".join(parts)
+
+
+class TransferProgress:
+    def __init__(self, callback=None, max_rate=20, window=3.0):
+        self.callback = callback or {}
+        self.interval = 1.0 / max_rate
+        self.window = window
+        self.total_files = self.files = 0
+        self.total_bytes = self.done_bytes = self.network_bytes = 0
+        self._lock = threading.Lock()
+        self._t0 = self._last = time.monotonic()
+        self._samples = deque([(self._t0, 0)])
+
+    def start(self, total_files, total_bytes):
+        with self._lock:
+            self.total_files, self.total_bytes = total_files, total_bytes
+        self._emit(force=True)
+
+    def add(self, done=0, network=0, files=0):
+        with self._lock:
+            self.done_bytes += done
+            self.network_bytes += network
+            self.files += files
+        self._emit()
+
+    def finish(self):
+        self._emit(force=True)
+
+    def _emit(self, force=False):
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last < self.interval:
+                return
+            self._last = now
+            self._samples.append((now, self.network_bytes))
+            while len(self._samples) > 2 and now - self._samples[0][0] > self.window:
+                self._samples.popleft()
+            t_first, n_first = self._samples[0]
+            rate = (self.network_bytes - n_first) / (now - t_first) if now > t_first else 0.0
+            remaining = max(self.total_bytes - self.done_bytes, 0)
+            info = {"files": self.files, "total_files": self.total_files, "bytes": self.done_bytes,
+                    "total_bytes": self.total_bytes, "rate": rate,
+                    "eta": remaining / rate if rate > 0 and remaining else None}
+        self.callback.get("setInfo", lambda _: None)(info)
+
+
+class RateLimiter:
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(rate / 4, 1 << 16)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate) - n
+            self._last = now
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+
+class DownloadEngine:
+    def __init__(self, base_url=None, jobs=16, timeout=30, retries=3, store=None):
+        self.base_url = mirror_base() if base_url is None else base_url
+        self.store = store
+        self.jobs = jobs
+        self.timeout = timeout
+        self.retries = retries
+        self._local = threading.local()
+        self._conns = []
+        self._conns_lock = threading.Lock()
+        self._pool = None
+        self._ssl = ssl.create_default_context()
+        self.cancel = None
+        self.journal = None
+        self.progress = None
+        self.limiter = None
+        self.gate = None
+
+    def rewrite(self, url):
+        return mirror_url(url, self.base_url or "")
+
+    def _connection(self, scheme, netloc):
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get((scheme, netloc))
+        if conn is None:
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(netloc, timeout=self.timeout, context=self._ssl)
+            else:
+                conn = http.client.HTTPConnection(netloc, timeout=self.timeout)
+            conns[(scheme, netloc)] = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def _drop_connection(self, url):
+        parts = urllib.parse.urlsplit(self.rewrite(url))
+        conn = getattr(self._local, "conns", {}).pop((parts.scheme, parts.netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _backoff(self, attempt, resp=None):
+        delay = min(0.5 * 2 ** attempt, 8.0)
+        retry_after = resp.getheader("Retry-After") if resp is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = min(int(retry_after), 30)
+        if self.cancel is not None:
+            self.cancel.wait(delay)
+            self.check_cancel()
+        else:
+            time.sleep(delay)
+
+    def open(self, url, headers=None):
+        url = self.rewrite(url)
+        attempt = redirects = 0
+        while True:
+            parts = urllib.parse.urlsplit(url)
+            conn = self._connection(parts.scheme, parts.netloc)
+            reused = conn.sock is not None
+            target = parts.path + (f"?{parts.query}" if parts.query else "")
+            try:
+                conn.request("GET", target, headers={"User-Agent": USER_AGENT, **(headers or {})})
+                resp = conn.getresponse()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if reused:
+                    continue
+                attempt += 1
+                if attempt >= self.retries:
+                    raise DownloadError(f"Could not download {url}: {e}")
+                self._backoff(attempt - 1)
+                continue
+            if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location") and redirects < 5:
+                resp.read()
+                redirects += 1
+                url = urllib.parse.urljoin(url, resp.getheader("Location"))
+                continue
+            if (resp.status >= 500 or resp.status == 429) and attempt + 1 < self.retries:
+                resp.read()
+                attempt += 1
+                self._backoff(attempt - 1, resp)
+                continue
+            if resp.status >= 400:
+                resp.read()
+                error = DownloadError(f"HTTP {resp.status} for {url}")
+                error.status = resp.status
+                raise error
+            return resp
+
+    def read(self, url):
+        return self.open(url).read()
+
+    def fetch(self, task, known=None):
+        self.check_cancel()
+        if os.path.isfile(task.path):
+            if task.sha1 is None:
+                return False
+            st = os.stat(task.path)
+            entry = known.get(task.path) if known else None
+            if entry == [st.st_size, st.st_mtime_ns, task.sha1]:
+                return False
+            if task.size is None or st.st_size == task.size:
+                if _sha1_file(task.path) == task.sha1:
+                    if self.store is not None:
+                        self.store.adopt(task.path, task.sha1)
+                    return False
+        if self.journal is not None:
+            self.journal.begin(task.path)
+        if self.store is not None and task.sha1 and self.store.link(task.sha1, task.path):
+            self._journal_done(task)
+            return False
+        os.makedirs(os.path.dirname(task.path), exist_ok=True)
+        tmp = f"{task.path}.part"
+        sized = task.size is not None
+        for attempt in range(self.retries):
+            h = hashlib.sha1()
+            offset = os.path.getsize(tmp) if task.sha1 and os.path.isfile(tmp) else 0
+            if sized and offset > task.size:
+                offset = 0
+            if offset:
+                with open(tmp, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+            counted = 0
+            try:
+                if not offset or offset != task.size:
+                    resp = self.open(task.url, {"Range": f"bytes={offset}-"} if offset else None)
+                    if offset and resp.status != 206:
+                        offset = 0
+                        h = hashlib.sha1()
+                    if sized and offset:
+                        counted = self._report(offset)
+                    with open(tmp, "ab" if offset else "wb") as f:
+                        for chunk in iter(lambda: resp.read(1 << 16), b""):
+                            self.check_cancel()
+                            self._throttle(len(chunk))
+                            h.update(chunk)
+                            f.write(chunk)
+                            counted += self._report(len(chunk) if sized else 0, len(chunk))
+                elif sized:
+                    counted = self._report(offset)
+            except DownloadError as e:
+                self._report(-counted)
+                if getattr(e, "status", None) != 416 or attempt == self.retries - 1:
+                    raise
+                os.remove(tmp)
+                continue
+            except (OSError, http.client.HTTPException):
+                self._report(-counted)
+                self._drop_connection(task.url)
+                if attempt == self.retries - 1:
+                    raise
+                continue
+            if task.sha1 is not None and h.hexdigest() != task.sha1:
+                self._report(-counted)
+                os.remove(tmp)
+                if attempt == self.retries - 1:
+                    raise DownloadError(f"Checksum mismatch for {task.url}")
+                continue
+            if self.store is not None and task.sha1:
+                self.store.put(tmp, task.sha1)
+                self.store.link(task.sha1, task.path)
+            else:
+                os.replace(tmp, task.path)
+            if task.executable and os.name != "nt":
+                os.chmod(task.path, 0o755)
+            self._journal_done(task)
+            return True
+
+    def _report(self, done, network=0):
+        if self.progress is not None:
+            self.progress.add(done, network)
+        return done
+
+    def _throttle(self, n):
+        if self.gate is not None:
+            while not self.gate.wait(0.5):
+                self.check_cancel()
+        if self.limiter is not None:
+            self.limiter.consume(n)
+
+    def check_cancel(self):
+        if self.cancel is not None and self.cancel.is_set():
+            raise InstallCancelled("Installation cancelled")
+
+    def _journal_done(self, task):
+        if self.journal is not None and task.sha1:
+            self.journal.done(task.path, task.sha1)
+
+    def _fetch_counted(self, task, known):
+        downloaded = self.fetch(task, known)
+        self.progress.add(0 if downloaded else task.size or 0, files=1)
+        return downloaded
+
+    def download_all(self, tasks, callback=None, known=None):
+        unique = list({t.path: t for t in tasks}.values())
+        progress = self.progress = TransferProgress(callback)
+        progress.start(len(unique), sum(t.size or 0 for t in unique))
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="download")
+        pending = {self._pool.submit(self._fetch_counted, t, known) for t in unique}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_EXCEPTION)
+                for f in done:
+                    if f.exception() is not None:
+                        for p in pending:
+                            p.cancel()
+                        wait(pending)
+                        raise f.exception()
+        finally:
+            progress.finish()
+            self.progress = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._conns_lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
+
+
+MIRROR_CACHE_DIR = os.path.join(get_appdata_path(), "mirror_cache")
+MIRROR_TTL = 600
+MIRROR_HOSTS = (
+    "launchermeta.mojang.com", "launcher.mojang.com", "piston-meta.mojang.com", "piston-data.mojang.com",
+    "libraries.minecraft.net", "resources.download.minecraft.net",
+    "maven.fabricmc.net", "maven.minecraftforge.net", "maven.neoforged.net", "maven.quiltmc.org",
+)
+_IMMUTABLE_HOSTS = ("libraries.minecraft.net", "resources.download.minecraft.net")
+_SHA1_RE = re.compile(r"/[0-9a-f]{40}(/|$)")
+
+
+class MirrorCache:
+    def __init__(self, root=MIRROR_CACHE_DIR, upstream="", hosts=MIRROR_HOSTS, ttl=MIRROR_TTL, jobs=16):
+        self.root = root
+        self.hosts = set(hosts)
+        self.ttl = ttl
+        self.engine = DownloadEngine(base_url=upstream, jobs=jobs)
+        self._pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="mirror")
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "upstream_bytes": 0, "served_bytes": 0}
+
+    def path(self, host, path):
+        parts = [p for p in path.split("/") if p not in ("", ".", "..")]
+        return os.path.join(self.root, host, *parts)
+
+    def _fresh(self, host, path, local):
+        try:
+            mtime = os.stat(local).st_mtime
+        except OSError:
+            return False
+        return host in _IMMUTABLE_HOSTS or bool(_SHA1_RE.search(path)) or time.time() - mtime < self.ttl
+
+    def _download(self, url, local):
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+        tmp = f"{local}.part"
+        try:
+            resp = self.engine.open(url)
+            with open(tmp, "wb") as f:
+                shutil.copyfileobj(resp, f, 1 << 16)
+        except (OSError, http.client.HTTPException):
+            self.engine._drop_connection(url)
+            raise
+        self.count("upstream_bytes", os.path.getsize(tmp))
+        os.replace(tmp, local)
+
+    def count(self, key, n=1):
+        with self._locks_lock:
+            self.stats[key] += n
+
+    def get(self, host, path):
+        if host not in self.hosts:
+            raise PermissionError(host)
+        local = self.path(host, path)
+        if not self._fresh(host, path, local):
+            with self._locks_lock:
+                lock = self._locks.setdefault(local, threading.Lock())
+            with lock:
+                if not self._fresh(host, path, local):
+                    try:
+                        self._pool.submit(self._download, f"https://{host}{path}", local).result()
+                        self.count("misses")
+                        return local
+                    except (DownloadError, OSError, http.client.HTTPException):
+                        if not os.path.isfile(local):
+                            raise
+        self.count("hits")
+        return local
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self.engine.close()
+
+
+class _MirrorHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    cache = None
+
+    def do_GET(self):
+        self._serve(True)
+
+    def do_HEAD(self):
+        self._serve(False)
+
+    def _serve(self, body):
+        host, _, path = urllib.parse.urlsplit(self.path).path.lstrip("/").partition("/")
+        try:
+            local = self.cache.get(host, "/" + path)
+        except PermissionError:
+            self.send_error(403, f"Host not mirrored: {host}")
+            return
+        except (DownloadError, OSError, http.client.HTTPException) as e:
+            self.send_error(getattr(e, "status", 502), str(e))
+            return
+        size = os.path.getsize(local)
+        m = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        start = int(m.group(1)) if m and int(m.group(1)) < size else 0
+        if start:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json" if local.endswith(".json") else "application/octet-stream")
+        self.send_header("Content-Length", str(size - start))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        if body:
+            with open(local, "rb") as f:
+                f.seek(start)
+                shutil.copyfileobj(f, self.wfile, 1 << 16)
+            self.cache.count("served_bytes", size - start)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve_mirror(cache, bind="0.0.0.0", port=8080):
+    handler = type("MirrorHandler", (_MirrorHandler,), {"cache": cache})
+    server = http.server.ThreadingHTTPServer((bind, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def _find_manifest_entry(version_id, engine):
+    manifest = load_manifest_cache()
+    for refresh in (False, True):
+        if refresh:
+            manifest = refresh_manifest_cache(engine.rewrite(MANIFEST_URL))
+        for v in manifest.get("versions", []):
+            if v["id"] == version_id:
+                return v
+    raise DownloadError(f"Version {version_id} not found")
+
+
+def _version_json_path(version_id, mc_dir):
+    return os.path.join(mc_dir, "versions", version_id, f"{version_id}.json")
+
+
+def _load_version_json(version_id, mc_dir, engine):
+    path = _version_json_path(version_id, mc_dir)
+    if not os.path.isfile(path):
+        entry = _find_manifest_entry(version_id, engine)
+        engine.fetch(DownloadTask(entry["url"], path, entry.get("sha1")))
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _runtime_plan(component, mc_dir, engine, plan):
+    base = os.path.join(mc_dir, "runtime", component, _jvm_platform(), component)
+    try:
+        runtimes = json.loads(engine.read(JAVA_RUNTIME_MANIFEST_URL))
+        releases = runtimes.get(_jvm_platform(), {}).get(component)
+        if not releases:
+            return
+        files = json.loads(engine.read(releases[0]["manifest"]["url"]))["files"]
+    except (DownloadError, OSError):
+        if os.path.isdir(base):
+            return
+        raise
+    links = []
+    for name, entry in files.items():
+        path = os.path.join(base, *name.split("/"))
+        if entry["type"] == "file":
+            raw = entry["downloads"]["raw"]
+            plan["tasks"].append(DownloadTask(raw["url"], path, raw["sha1"], raw.get("size"), entry.get("executable", False)))
+        elif entry["type"] == "link":
+            links.append((entry["target"], path))
+    plan["runtime"] = {"component": component, "version": releases[0]["version"]["name"], "links": links}
+
+
+def build_install_plan(version_id, mc_dir, engine):
+    data = _load_version_json(version_id, mc_dir, engine)
+    jar_path = os.path.join(mc_dir, "versions", version_id, f"{version_id}.jar")
+    if "inheritsFrom" in data:
+        plan = build_install_plan(data["inheritsFrom"], mc_dir, engine)
+        parent_jar = os.path.join(mc_dir, "versions", data["inheritsFrom"], f"{data['inheritsFrom']}.jar")
+        if "client" not in data.get("downloads", {}):
+            plan["jar_copies"].append((parent_jar, jar_path))
+    else:
+        plan = {"tasks": [], "natives": [], "runtime": None, "jar_copies": [], "jsons": []}
+    plan["id"] = version_id
+    plan["jsons"].append(_version_json_path(version_id, mc_dir))
+    lib_dir = os.path.join(mc_dir, "libraries")
+    arch = "32" if platform.architecture()[0] == "32bit" else "64"
+    for lib in data.get("libraries", []):
+        if not _rules_allow(lib.get("rules")):
+            continue
+        downloads = lib.get("downloads")
+        if downloads is None:
+            rel = _library_path(lib["name"])
+            base = lib.get("url") or LIBRARIES_URL
+            plan["tasks"].append(DownloadTask(base.rstrip("/") + "/" + rel, os.path.join(lib_dir, *rel.split("/"))))
+            continue
+        artifact = downloads.get("artifact")
+        if artifact and artifact.get("url") and artifact.get("path"):
+            plan["tasks"].append(DownloadTask(artifact["url"], os.path.join(lib_dir, *artifact["path"].split("/")),
+                                              artifact.get("sha1"), artifact.get("size")))
+        native = lib.get("natives", {}).get(_os_name())
+        if native:
+            classifier = downloads.get("classifiers", {}).get(native.replace("${arch}", arch))
+            if classifier:
+                path = os.path.join(lib_dir, *classifier["path"].split("/"))
+                plan["tasks"].append(DownloadTask(classifier["url"], path, classifier.get("sha1"), classifier.get("size")))
+                plan["natives"].append((path, lib.get("extract", {}).get("exclude", [])))
+    client = data.get("downloads", {}).get("client")
+    if client:
+        plan["tasks"].append(DownloadTask(client["url"], jar_path, client.get("sha1"), client.get("size")))
+    logging_file = data.get("logging", {}).get("client", {}).get("file")
+    if logging_file:
+        plan["tasks"].append(DownloadTask(logging_file["url"], os.path.join(mc_dir, "assets", "log_configs", logging_file["id"]),
+                                          logging_file.get("sha1"), logging_file.get("size")))
+    asset_index = data.get("assetIndex")
+    if asset_index:
+        index_path = os.path.join(mc_dir, "assets", "indexes", f"{asset_index['id']}.json")
+        engine.fetch(DownloadTask(asset_index["url"], index_path, asset_index.get("sha1"), asset_index.get("size")))
+        with open(index_path, "r", encoding="utf-8") as f:
+            objects = json.load(f).get("objects", {})
+        for obj in objects.values():
+            h = obj["hash"]
+            plan["tasks"].append(DownloadTask(f"{RESOURCES_URL}{h[:2]}/{h}",
+                                              os.path.join(mc_dir, "assets", "objects", h[:2], h), h, obj.get("size")))
+    if "javaVersion" in data:
+        _runtime_plan(data["javaVersion"]["component"], mc_dir, engine, plan)
+    return plan
+
+
+def _extract_natives(jar_path, natives_dir, exclude):
+    os.makedirs(natives_dir, exist_ok=True)
+    with zipfile.ZipFile(jar_path) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or any(info.filename.startswith(e) for e in exclude):
+                continue
+            target = os.path.join(natives_dir, *info.filename.split("/"))
+            if os.path.isfile(target) and os.path.getsize(target) == info.file_size:
+                continue
+            zf.extract(info, natives_dir)
+
+
+INSTALL_JOURNAL_DIR = os.path.join(get_appdata_path(), "journal")
+
+
+class InstallJournal:
+    def __init__(self, mc_dir, path=None):
+        self.mc_dir = os.path.abspath(mc_dir)
+        self.path = path or os.path.join(INSTALL_JOURNAL_DIR, f"{_dir_key(mc_dir)}.jsonl")
+        self.created = set()
+        self.completed = {}
+        self._lock = threading.Lock()
+        self._file = None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        break
+                    if rec["op"] == "new":
+                        self.created.add(rec["path"])
+                    elif rec["op"] == "done":
+                        self.completed[rec["path"]] = rec["key"]
+        except OSError:
+            pass
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _append(self, rec):
+        self._file.write(json.dumps(rec) + "\n")
+        self._file.flush()
+
+    def begin(self, path):
+        with self._lock:
+            if path in self.created or os.path.lexists(path):
+                return
+            self.created.add(path)
+            self._append({"op": "new", "path": path})
+
+    def done(self, path, sha1):
+        key = _stat_key(path) + [sha1]
+        with self._lock:
+            self.completed[path] = key
+            self._append({"op": "done", "path": path, "key": key})
+
+    def known(self):
+        with self._lock:
+            return dict(self.completed)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def commit(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def rollback(self):
+        self.close()
+        for path in sorted(self.created, reverse=True):
+            for target in (path, f"{path}.part"):
+                try:
+                    if os.path.isdir(target) and not os.path.islink(target):
+                        shutil.rmtree(target)
+                    else:
+                        os.remove(target)
+                except OSError:
+                    pass
+            parent = os.path.dirname(path)
+            while parent.startswith(self.mc_dir + os.sep):
+                try:
+                    os.rmdir(parent)
+                except OSError:
+                    break
+                parent = os.path.dirname(parent)
+        self.commit()
+
+
+def _finish_install(version_id, mc_dir, plan, journal=None):
+    begin = journal.begin if journal is not None else (lambda _: None)
+    natives_dir = os.path.join(mc_dir, "versions", version_id, "natives")
+    if plan["natives"]:
+        begin(natives_dir)
+    for jar_path, exclude in plan["natives"]:
+        _extract_natives(jar_path, natives_dir, exclude)
+    for src, dst in plan["jar_copies"]:
+        if not os.path.isfile(dst):
+            begin(dst)
+            shutil.copyfile(src, dst)
+    runtime = plan["runtime"]
+    if runtime:
+        for target, path in runtime["links"]:
+            if not os.path.lexists(path):
+                begin(path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                try:
+                    os.symlink(target, path)
+                except OSError:
+                    pass
+        version_file = os.path.join(mc_dir, "runtime", runtime["component"], _jvm_platform(), ".version")
+        with open(version_file, "w", encoding="utf-8") as f:
+            f.write(runtime["version"])
+        JAVA_RUNTIMES.add(os.path.join(os.path.dirname(version_file), runtime["component"]), mc_dir)
+    save_integrity_index(version_id, mc_dir, plan)
+
+
+_install_locks = {}
+_install_locks_lock = threading.Lock()
+
+
+def install_lock(mc_dir):
+    with _install_locks_lock:
+        return _install_locks.setdefault(_dir_key(mc_dir), threading.Lock())
+
+
+def install_versions(version_ids, mc_dir, callback=None, engine=None, cancel=None, rollback=True):
+    own_engine = engine is None
+    engine = engine or DownloadEngine(store=default_store())
+    lock = install_lock(mc_dir)
+    lock.acquire()
+    journal = InstallJournal(mc_dir)
+    engine.cancel, engine.journal = cancel, journal
+    t0 = time.perf_counter()
+    try:
+        journal.open()
+        callback = callback or {}
+        callback.get("setStatus", lambda _: None)("Preparing download")
+        with TRACER.span("install.plan", "install", versions=version_ids):
+            plans = [build_install_plan(version_id, mc_dir, engine) for version_id in version_ids]
+            known = journal.known()
+            for version_id in version_ids:
+                known.update(load_integrity_index(version_id, mc_dir).get("files", {}))
+        callback.get("setStatus", lambda _: None)("Downloading")
+        tasks = [t for plan in plans for t in plan["tasks"]]
+        with TRACER.span("install.download", "install", files=len(tasks), bytes=sum(t.size or 0 for t in tasks)):
+            engine.download_all(tasks, callback, known=known)
+        callback.get("setStatus", lambda _: None)("Extracting natives")
+        with TRACER.span("install.finish", "install"):
+            for version_id, plan in zip(version_ids, plans):
+                engine.check_cancel()
+                _finish_install(version_id, mc_dir, plan, journal)
+        journal.commit()
+        record_trace_history("install", TRACER.since(t0, ("install",)), versions=version_ids)
+        callback.get("setStatus", lambda _: None)("Installation complete")
+        return plans
+    except InstallCancelled:
+        if rollback:
+            journal.rollback()
+        raise
+    finally:
+        journal.close()
+        engine.cancel = engine.journal = None
+        lock.release()
+        if own_engine:
+            engine.close()
+
+
+def install_version(version_id, mc_dir, callback=None, engine=None, cancel=None):
+    return install_versions([version_id], mc_dir, callback, engine, cancel)[0]
+
+
+PREFETCH_IDLE_MS = 60_000
+PREFETCH_RECENT = 2
+
+
+def predict_versions(manifest=None, limit=PREFETCH_RECENT):
+    played = STATE.last_played()
+    version_ids = sorted(played, key=played.get, reverse=True)[:limit]
+    latest = (manifest or {}).get("latest", {}).get("release")
+    if latest and latest not in version_ids:
+        version_ids.append(latest)
+    return version_ids
+
+
+def prefetch_versions(version_ids, mc_dir, engine, manifest=None, cancel=None):
+    entries = {v["id"]: v for v in (manifest or {}).get("versions", [])}
+    fetched = []
+    for version_id in version_ids:
+        if cancel is not None and cancel.is_set():
+            break
+        try:
+            entry = entries.get(version_id)
+            if entry and entry.get("sha1"):
+                with install_lock(mc_dir):
+                    engine.fetch(DownloadTask(entry["url"], _version_json_path(version_id, mc_dir), entry["sha1"]))
+            if is_install_intact(version_id, mc_dir):
+                continue
+            install_versions([version_id], mc_dir, engine=engine, cancel=cancel, rollback=False)
+            fetched.append(version_id)
+        except InstallCancelled:
+            break
+        except (DownloadError, OSError, http.client.HTTPException) as e:
+            print(f"Prefetch of {version_id} failed: {e}")
+    return fetched
+
+
+INTEGRITY_DIR = os.path.join(get_appdata_path(), "integrity")
+
+
+def _integrity_file(version_id, mc_dir):
+    return os.path.join(INTEGRITY_DIR, _dir_key(mc_dir), f"{version_id}.json")
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def load_integrity_index(version_id, mc_dir):
+    try:
+        with open(_integrity_file(version_id, mc_dir), "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except Exception:
+        return {}
+    return index if index.get("mc_dir") == os.path.abspath(mc_dir) else {}
+
+
+def save_integrity_index(version_id, mc_dir, plan):
+    files = {}
+    for task in plan["tasks"]:
+        if task.path not in files:
+            files[task.path] = _stat_key(task.path) + [task.sha1]
+    _write_json_atomic(_integrity_file(version_id, mc_dir), {
+        "mc_dir": os.path.abspath(mc_dir),
+        "jsons": {p: _stat_key(p) for p in plan["jsons"]},
+        "natives": bool(plan["natives"]),
+        "files": files,
+    })
+
+
+def is_install_intact(version_id, mc_dir):
+    index = load_integrity_index(version_id, mc_dir)
+    if not index:
+        return False
+    try:
+        for path, key in index["jsons"].items():
+            if _stat_key(path) != key:
+                return False
+        if index["natives"] and not os.path.isdir(os.path.join(mc_dir, "versions", version_id, "natives")):
+            return False
+        changed = False
+        for path, entry in index["files"].items():
+            key = _stat_key(path)
+            if key == entry[:2]:
+                continue
+            if entry[2] is None or _sha1_file(path) != entry[2]:
+                return False
+            entry[:2] = key
+            changed = True
+    except OSError:
+        return False
+    if changed:
+        _write_json_atomic(_integrity_file(version_id, mc_dir), index)
+    return True
+
+
+JAVA_REGISTRY_FILE = os.path.join(get_appdata_path(), "java_runtimes.json")
+JAVA_PROBE_TIMEOUT = 15
+_JAVA_NAMES = ("javaw.exe", "java.exe") if os.name == "nt" else ("java",)
+
+JavaRuntime = namedtuple("JavaRuntime", "path version major vendor arch")
+
+
+def _java_major(version):
+    m = re.match(r"(\d+)(?:\.(\d+))?", version)
+    if not m:
+        return 0
+    return int(m.group(2) or 0) if m.group(1) == "1" else int(m.group(1))
+
+
+def _probe_java(path):
+    try:
+        out = subprocess.run(
+            [path, "-XshowSettings:properties", "-version"], capture_output=True, encoding="utf-8",
+            errors="replace", timeout=JAVA_PROBE_TIMEOUT,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
+        ).stderr
+    except (OSError, subprocess.SubprocessError):
+        return None
+    props = dict(re.findall(r"^\s*([\w.]+) = (.*?)\s*$", out, re.M))
+    version = props.get("java.version")
+    if not version:
+        return None
+    return {"version": version, "major": _java_major(version),
+            "vendor": props.get("java.vendor", ""), "arch": props.get("os.arch", "")}
+
+
+def _subdirs(path):
+    try:
+        return [e.path for e in os.scandir(path) if e.is_dir()]
+    except OSError:
+        return []
+
+
+def _find_java(root, depth=1):
+    for bin_dir in (root, os.path.join(root, "bin")):
+        for name in _JAVA_NAMES:
+            path = os.path.join(bin_dir, name)
+            if os.path.isfile(path):
+                return [path]
+    if depth <= 0:
+        return []
+    return [p for d in _subdirs(root) for p in _find_java(d, depth - 1)]
+
+
+def _java_search_roots(mc_dir):
+    roots = [(os.environ[var], 0) for var in ("JAVA_HOME", "JDK_HOME", "JRE_HOME") if os.getenv(var)]
+    roots += [(d, 0) for d in os.getenv("PATH", "").split(os.pathsep) if d]
+    roots.append((os.path.join(mc_dir, "runtime"), 3))
+    if os.name == "nt":
+        for base in {os.getenv("ProgramFiles"), os.getenv("ProgramFiles(x86)"), os.getenv("ProgramW6432")} - {None}:
+            for vendor in ("Java", "Eclipse Adoptium", "AdoptOpenJDK", "Zulu", "Microsoft", "BellSoft",
+                           "Amazon Corretto", "Semeru"):
+                roots.append((os.path.join(base, vendor), 1))
+        roots.append((os.path.expandvars(r"%LOCALAPPDATA%\Packages\Microsoft.4297127D64EC6_8wekyb3d8bbwe"
+                                         r"\LocalCache\Local\runtime"), 3))
+    elif platform.system() == "Darwin":
+        roots += [("/Library/Java/JavaVirtualMachines", 3),
+                  (os.path.expanduser("~/Library/Java/JavaVirtualMachines"), 3)]
+    else:
+        roots += [("/usr/lib/jvm", 1), ("/usr/lib64/jvm", 1), ("/usr/java", 1), ("/opt", 1),
+                  (os.path.expanduser("~/.sdkman/candidates/java"), 1)]
+    roots.append((os.path.expanduser("~/.jdks"), 1))
+    return roots
+
+
+class JavaRegistry:
+    def __init__(self, cache_file=JAVA_REGISTRY_FILE, jobs=8):
+        self.cache_file = cache_file
+        self.jobs = jobs
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._dirty = False
+        self._found = {}
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                self._probes = json.load(f)
+        except Exception:
+            self._probes = {}
+
+    def probe(self, path):
+        path = os.path.realpath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = [st.st_size, st.st_mtime_ns]
+        with self._lock:
+            cached = self._probes.get(path)
+        if cached is None or cached["stat"] != key:
+            cached = {"stat": key, "info": _probe_java(path)}
+            with self._lock:
+                self._probes[path] = cached
+                self._dirty = True
+        return JavaRuntime(path, **cached["info"]) if cached["info"] else None
+
+    def scan(self, mc_dir=None):
+        with self._scan_lock:
+            with ThreadPoolExecutor(self.jobs) as pool:
+                found = pool.map(lambda root: _find_java(*root), _java_search_roots(mc_dir or get_minecraft_dir()))
+                paths = sorted({os.path.realpath(p) for paths in found for p in paths})
+                runtimes = [r for r in pool.map(self.probe, paths) if r]
+            with self._lock:
+                self._found[os.path.abspath(mc_dir or get_minecraft_dir())] = runtimes
+            self._save()
+            return runtimes
+
+    def refresh(self, mc_dir=None):
+        if not self._scan_lock.locked():
+            threading.Thread(target=self.scan, args=(mc_dir,), name="java-scan", daemon=True).start()
+
+    def add(self, root, mc_dir=None):
+        runtimes = [r for r in map(self.probe, _find_java(root, 3)) if r]
+        paths = {r.path for r in runtimes}
+        key = os.path.abspath(mc_dir or get_minecraft_dir())
+        with self._lock:
+            if key in self._found:
+                self._found[key] = [r for r in self._found[key] if r.path not in paths] + runtimes
+        self._save()
+        return runtimes
+
+    def runtimes(self, mc_dir=None):
+        with self._lock:
+            found = self._found.get(os.path.abspath(mc_dir or get_minecraft_dir()))
+            if found is not None:
+                return list(found)
+            cached = [(path, entry) for path, entry in self._probes.items() if entry["info"]]
+        runtimes = []
+        for path, entry in cached:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if [st.st_size, st.st_mtime_ns] == entry["stat"]:
+                runtimes.append(JavaRuntime(path, **entry["info"]))
+        return runtimes
+
+    def best(self, major, mc_dir=None):
+        mc_dir = mc_dir or get_minecraft_dir()
+        runtime_dir = os.path.realpath(os.path.join(mc_dir, "runtime")) + os.sep
+        runtimes = self.runtimes(mc_dir)
+        if runtimes:
+            self.refresh(mc_dir)
+        else:
+            runtimes = self.scan(mc_dir)
+        candidates = [r for r in runtimes if r.major >= major]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda r: (r.major - major, "64" not in r.arch,
+                                              not r.path.startswith(runtime_dir), r.path))
+
+    def _save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            probes = {p: e for p, e in self._probes.items() if os.path.exists(p)}
+            self._dirty = False
+        try:
+            _write_json_atomic(self.cache_file, probes)
+        except OSError:
+            pass
+
+
+JAVA_RUNTIMES = JavaRegistry()
+
+
+def required_java_major(version_id, mc_dir):
+    while version_id:
+        try:
+            with open(_version_json_path(version_id, mc_dir), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            break
+        if "javaVersion" in data:
+            return data["javaVersion"].get("majorVersion", 8)
+        version_id = data.get("inheritsFrom")
+    return 8
+
+
+def pick_java(version_id, mc_dir, preferred=None):
+    major = required_java_major(version_id, mc_dir)
+    override = STATE.config("java_overrides", {}).get(version_id)
+    if override:
+        runtime = JAVA_RUNTIMES.probe(override)
+        if runtime:
+            return runtime
+        print(f"Java override for {version_id} is not usable: {override}")
+    if preferred:
+        runtime = JAVA_RUNTIMES.probe(preferred)
+        if runtime and runtime.major >= major:
+            return runtime
+        print(f"Selected Java {preferred} cannot run {version_id} (needs Java {major}), picking one automatically")
+    return JAVA_RUNTIMES.best(major, mc_dir)
+
+
+_MEMORY_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+_MEMORY_FLAGS = ("-Xms", "-Xmx", "-Xmn", "-Xss", "-XX:MaxMetaspaceSize=", "-XX:MetaspaceSize=",
+                 "-XX:MaxDirectMemorySize=", "-XX:G1HeapRegionSize=", "-XX:ReservedCodeCacheSize=")
+
+
+def parse_memory_size(text):
+    m = re.fullmatch(r"\s*(\d+)\s*([kKmMgGtT]?)\s*", str(text))
+    if not m:
+        raise ValueError(f"Invalid memory size: {text!r}")
+    return int(m.group(1)) * _MEMORY_UNITS[m.group(2).lower()]
+
+
+def format_memory_size(size):
+    for unit in ("T", "G", "M", "K"):
+        scale = _MEMORY_UNITS[unit.lower()]
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return str(size)
+
+
+def _jvm_arg_key(arg):
+    if arg.startswith("-XX:"):
+        return "XX:" + re.split(r"=", arg[4:].lstrip("+-"), 1)[0]
+    if arg.startswith("-D"):
+        return "D:" + arg[2:].split("=", 1)[0]
+    for flag in _MEMORY_FLAGS:
+        if arg.startswith(flag):
+            return flag
+    return arg
+
+
+def validate_jvm_args(args):
+    errors = []
+    sizes = {}
+    for arg in args:
+        for flag in _MEMORY_FLAGS:
+            if arg.startswith(flag):
+                try:
+                    sizes[flag] = parse_memory_size(arg[len(flag):])
+                except ValueError:
+                    errors.append(f"{arg}: invalid memory size")
+                break
+        else:
+            if not arg.startswith("-"):
+                errors.append(f"{arg}: JVM options must start with '-'")
+    if sizes.get("-Xms", 0) > sizes.get("-Xmx", float("inf")):
+        errors.append("-Xms is larger than -Xmx")
+    if len({a for a in args if re.fullmatch(r"-XX:\+Use\w*GC", a)}) > 1:
+        errors.append("More than one garbage collector selected")
+    return errors
+
+
+def host_resources():
+    try:
+        import psutil
+        total = psutil.virtual_memory().total
+    except Exception:
+        try:
+            total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (AttributeError, ValueError, OSError):
+            total = 8 << 30
+    return total, os.cpu_count() or 2
+
+
+def _large_page_args():
+    if platform.system() != "Linux":
+        return []
+    try:
+        with open("/sys/kernel/mm/transparent_hugepage/enabled", "r") as f:
+            mode = f.read()
+    except OSError:
+        return []
+    return ["-XX:+UseTransparentHugePages"] if "[always]" in mode or "[madvise]" in mode else []
+
+
+def default_heap_size(total=None):
+    total = total or host_resources()[0]
+    heap = min(total // 2, total - (3 << 30), 8 << 30)
+    return max(heap // (512 << 20) * (512 << 20), 1 << 30)
+
+
+def _g1_args(pause, cpus):
+    return ["-XX:+UseG1GC", f"-XX:MaxGCPauseMillis={pause}", "-XX:+ParallelRefProcEnabled",
+            f"-XX:ParallelGCThreads={max(cpus - 2, 1)}", f"-XX:ConcGCThreads={max(cpus // 4, 1)}"]
+
+
+def _profile_balanced(heap, cpus, java_major):
+    return [f"-Xms{format_memory_size(heap // 2)}", f"-Xmx{format_memory_size(heap)}"] + _g1_args(50, cpus)
+
+
+def _profile_g1_low_pause(heap, cpus, java_major):
+    return [f"-Xms{format_memory_size(heap)}", f"-Xmx{format_memory_size(heap)}"] + _g1_args(37, cpus) + [
+        "-XX:+UnlockExperimentalVMOptions", "-XX:G1NewSizePercent=20", "-XX:G1MaxNewSizePercent=40",
+        "-XX:G1ReservePercent=20", "-XX:G1HeapRegionSize=16M", "-XX:G1MixedGCCountTarget=4",
+        "-XX:+DisableExplicitGC"] + _large_page_args()
+
+
+def _profile_zgc(heap, cpus, java_major):
+    if java_major < 11:
+        return _profile_g1_low_pause(heap, cpus, java_major)
+    args = [f"-Xms{format_memory_size(heap)}", f"-Xmx{format_memory_size(heap)}"]
+    if java_major < 15:
+        args.append("-XX:+UnlockExperimentalVMOptions")
+    args += ["-XX:+UseZGC", f"-XX:ConcGCThreads={max(cpus // 4, 1)}", "-XX:+DisableExplicitGC"]
+    if 21 <= java_major < 24:
+        args.append("-XX:+ZGenerational")
+    return args + _large_page_args()
+
+
+def _profile_throughput(heap, cpus, java_major):
+    return [f"-Xms{format_memory_size(heap)}", f"-Xmx{format_memory_size(heap)}", "-XX:+UseParallelGC",
+            f"-XX:ParallelGCThreads={max(cpus - 1, 1)}"] + _large_page_args()
+
+
+def _profile_none(heap, cpus, java_major):
+    return [f"-Xms{format_memory_size(heap // 2)}", f"-Xmx{format_memory_size(heap)}"]
+
+
+JVM_PROFILES = {
+    "balanced": ("Balanced (G1)", _profile_balanced),
+    "g1_low_pause": ("G1 low pause", _profile_g1_low_pause),
+    "zgc": ("ZGC", _profile_zgc),
+    "throughput": ("Throughput (Parallel GC)", _profile_throughput),
+    "none": ("Heap only", _profile_none),
+}
+
+
+def tuned_jvm_args(profile, custom_args=None, java_major=8):
+    custom_args = list(custom_args or [])
+    total, cpus = host_resources()
+    heap = default_heap_size(total)
+    sizes = {}
+    for arg in custom_args:
+        if arg[:4] in ("-Xms", "-Xmx"):
+            try:
+                sizes[arg[:4]] = parse_memory_size(arg[4:])
+            except ValueError:
+                pass
+    heap = sizes.get("-Xmx", max(heap, sizes.get("-Xms", 0)))
+    build = JVM_PROFILES.get(profile, JVM_PROFILES["none"])[1]
+    base = build(heap, cpus, java_major)
+    custom_keys = {_jvm_arg_key(a) for a in custom_args}
+    custom_gc = any(re.fullmatch(r"-XX:\+Use\w*GC", a) for a in custom_args)
+    merged = [a for a in base if _jvm_arg_key(a) not in custom_keys
+              and not (custom_gc and re.fullmatch(r"-XX:\+Use\w*GC", a))]
+    return merged + custom_args
+
+
+CDS_DIR = os.path.join(get_appdata_path(), "cds")
+CDS_MIN_JAVA = 13
+CDS_AUTO_JAVA = 19
+
+
+def _version_chain(version_id, mc_dir):
+    chain = []
+    while version_id and version_id not in chain:
+        chain.append(version_id)
+        try:
+            with open(_version_json_path(version_id, mc_dir), "r", encoding="utf-8") as f:
+                version_id = json.load(f).get("inheritsFrom")
+        except Exception:
+            break
+    return chain
+
+
+def cds_archive(version_id, mc_dir, runtime):
+    h = hashlib.sha1()
+    for vid in _version_chain(version_id, mc_dir):
+        h.update(json.dumps([vid] + _stat_key(_version_json_path(vid, mc_dir))).encode("utf-8"))
+    h.update(json.dumps([runtime.path, runtime.version] + _stat_key(runtime.path)).encode("utf-8"))
+    stem = _dir_key(mc_dir) + "-" + re.sub(r"[^\w.-]", "_", version_id)
+    return os.path.join(CDS_DIR, f"{stem}-{h.hexdigest()[:16]}.jsa")
+
+
+def cds_args(version_id, mc_dir, runtime):
+    if runtime is None or runtime.major < CDS_MIN_JAVA or not STATE.config("class_data_sharing", True):
+        return []
+    try:
+        archive = cds_archive(version_id, mc_dir, runtime)
+        os.makedirs(CDS_DIR, exist_ok=True)
+        stem = os.path.basename(archive).rsplit("-", 1)[0]
+        for entry in os.scandir(CDS_DIR):
+            if entry.name.rsplit("-", 1)[0] == stem and entry.path != archive:
+                os.remove(entry.path)
+    except OSError:
+        return []
+    if runtime.major >= CDS_AUTO_JAVA:
+        return ["-XX:+AutoCreateSharedArchive", f"-XX:SharedArchiveFile={archive}"]
+    if os.path.isfile(archive):
+        return [f"-XX:SharedArchiveFile={archive}"]
+    return [f"-XX:ArchiveClassesAtExit={archive}"]
+
+
+LAUNCH_PLAN_DIR = os.path.join(get_appdata_path(), "launch_plans")
+LAUNCH_PLAN_FORMAT = 1
+_SESSION_PLACEHOLDERS = {"username": "@@ASPHALT_USERNAME@@", "uuid": "@@ASPHALT_UUID@@", "token": "@@ASPHALT_TOKEN@@"}
+_launch_plans = {}
+
+
+def _launch_plan_key(version_id, mc_dir, options):
+    parts = [LAUNCH_PLAN_FORMAT, os.path.abspath(mc_dir), version_id, options]
+    for vid in _version_chain(version_id, mc_dir):
+        parts.append([vid] + _stat_key(_version_json_path(vid, mc_dir)))
+    if options.get("executablePath"):
+        parts.append(_stat_key(options["executablePath"]))
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _launch_plan_file(version_id, mc_dir):
+    return os.path.join(LAUNCH_PLAN_DIR, _dir_key(mc_dir), re.sub(r"[^\w.-]", "_", version_id) + ".json")
+
+
+def launch_plan(version_id, mc_dir, options):
+    options = {k: v for k, v in options.items() if k not in _SESSION_PLACEHOLDERS}
+    key = _launch_plan_key(version_id, mc_dir, options)
+    command = _launch_plans.get(key)
+    if command is not None:
+        return command
+    path = _launch_plan_file(version_id, mc_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("key") == key:
+            command = cached["command"]
+    except Exception:
+        pass
+    if command is None:
+        with TRACER.span("launch.plan_build", "launch"):
+            import minecraft_launcher_lib
+            command = minecraft_launcher_lib.command.get_minecraft_command(
+                version_id, mc_dir, {**options, **_SESSION_PLACEHOLDERS})
+        try:
+            _write_json_atomic(path, {"key": key, "command": command})
+        except OSError:
+            pass
+    _launch_plans[key] = command
+    return command
+
+
+def _fill_session(command, session):
+    filled = []
+    for arg in command:
+        for field, placeholder in _SESSION_PLACEHOLDERS.items():
+            arg = arg.replace(placeholder, session[field])
+        filled.append(arg)
+    return filled
+
+
+def build_launch_command(username, version, java_executable=None, jvm_args=None, jvm_profile=None, mc_dir=None,
+                         verified=False):
+    offline_uuid = str(uuid.uuid3(uuid.NAMESPACE_OID, username))
+    session = {"username": username, "uuid": offline_uuid, "token": "0" * 32}
+    options = {"enableLoggingConfig": True}
+    mc_dir = mc_dir or get_minecraft_dir()
+    if not verified:
+        with TRACER.span("launch.verify", "launch"):
+            intact = is_install_intact(version, mc_dir)
+        if not intact:
+            install_version(version, mc_dir)
+    with TRACER.span("launch.pick_java", "launch"):
+        runtime = pick_java(version, mc_dir, java_executable)
+    if runtime:
+        options["executablePath"] = runtime.path
+    with TRACER.span("launch.jvm_args", "launch"):
+        java_major = runtime.major if runtime else required_java_major(version, mc_dir)
+        options["jvmArguments"] = tuned_jvm_args(jvm_profile, jvm_args, java_major) + cds_args(version, mc_dir, runtime)
+    options["nativesDirectory"] = os.path.join(mc_dir, "versions", version, "natives")
+    with TRACER.span("launch.command", "launch"):
+        return _fill_session(launch_plan(version, mc_dir, options), session)
+
+
+GAME_LOG_DIR = os.path.join(get_appdata_path(), "logs")
+GAME_LOG_LINES = 5000
+GAME_LOG_KEEP = 20
+
+
+class Log4jStreamParser:
+    _attr_re = re.compile(r'(\w+)="([^"]*)"')
+    _cdata_re = re.compile(r"<log4j:(Message|Throwable)><!\[CDATA\[(.*?)\]\]></log4j:\1>", re.S)
+
+    def __init__(self, max_event=1 << 20):
+        self.max_event = max_event
+        self._buf = []
+        self._size = 0
+
+    def feed(self, line):
+        if not self._buf:
+            if "<log4j:Event" not in line:
+                return [line.rstrip("\r\n")]
+        self._buf.append(line)
+        self._size += len(line)
+        if "</log4j:Event>" in line:
+            return [self._parse("".join(self._take()))]
+        if self._size > self.max_event:
+            return [l.rstrip("\r\n") for l in self._take()]
+        return []
+
+    def flush(self):
+        return [l.rstrip("\r\n") for l in self._take()]
+
+    def _take(self):
+        buf, self._buf, self._size = self._buf, [], 0
+        return buf
+
+    def _parse(self, event):
+        head = event[:event.find(">")]
+        attrs = {k: html.unescape(v) for k, v in self._attr_re.findall(head)}
+        parts = {k: v for k, v in self._cdata_re.findall(event)}
+        try:
+            stamp = datetime.fromtimestamp(int(attrs.get("timestamp", "0")) / 1000).strftime("%H:%M:%S")
+        except (ValueError, OSError):
+            stamp = "??:??:??"
+        text = f"[{stamp}] [{attrs.get('thread', '?')}/{attrs.get('level', '?')}]: {parts.get('Message', '').rstrip()}"
+        if parts.get("Throwable"):
+            text += "\n" + parts["Throwable"].rstrip()
+        return text
+
+
+class GameLog:
+    def __init__(self, path=None, max_lines=GAME_LOG_LINES, max_bytes=5 * 1024 * 1024, backups=3):
+        self.path = path
+        self._lines = deque(maxlen=max_lines)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._file = logging.handlers.RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+
+    def append(self, text):
+        with self._lock:
+            self._seq += 1
+            self._lines.append((self._seq, text))
+        if self._file is not None:
+            self._file.handle(logging.makeLogRecord({"msg": text}))
+
+    def lines_since(self, seq):
+        with self._lock:
+            if not self._lines or self._lines[-1][0] <= seq:
+                return seq, []
+            return self._seq, [text for n, text in self._lines if n > seq]
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _prune_game_logs(log_dir, keep=GAME_LOG_KEEP):
+    try:
+        logs = sorted((e for e in os.scandir(log_dir) if e.is_file()), key=lambda e: e.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for entry in logs[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+GAME_READY_RE = re.compile(r"Sound engine started|Created: \d+x\d+x\d+ minecraft:textures/atlas/blocks")
+
+
+class GameSession:
+    def __init__(self, version_id, proc, log, launch_t0=None):
+        self.version_id = version_id
+        self.proc = proc
+        self.pid = proc.pid
+        self.log = log
+        self.started = time.monotonic()
+        self.launch_t0 = launch_t0 or time.perf_counter()
+        self.first_output = None
+        self.ready = None
+        self.traced = False
+        self.exit_code = None
+        self.runtime = None
+
+
+class SessionSupervisor(QObject):
+    session_started = Signal(object)
+    session_finished = Signal(object)
+    _exited = Signal(object)
+
+    def __init__(self, parent=None, log_dir=None):
+        super().__init__(parent)
+        self.log_dir = log_dir
+        self.sessions = {}
+        self.last_session = None
+        self._trace_lock = threading.Lock()
+        self._exited.connect(self._on_exited)
+
+    def start(self, version_id, command, cwd, launch_t0=None):
+        with TRACER.span("launch.spawn", "launch"):
+            proc = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
+                cwd=cwd
+            )
+        log_path = None
+        if self.log_dir:
+            _prune_game_logs(self.log_dir)
+            log_path = os.path.join(self.log_dir, f"{version_id}-{datetime.now():%Y%m%d-%H%M%S}-{proc.pid}.log")
+        session = GameSession(version_id, proc, GameLog(log_path), launch_t0)
+        self.sessions[session.pid] = session
+        self.last_session = session
+        threading.Thread(target=self._pump, args=(session,), name=f"session-log-{session.pid}", daemon=True).start()
+        threading.Thread(target=self._watch, args=(session,), name=f"session-{session.pid}", daemon=True).start()
+        self.session_started.emit(session)
+        return session
+
+    def _pump(self, session):
+        parser = Log4jStreamParser()
+        waiting = True
+        try:
+            for raw in session.proc.stdout:
+                if waiting:
+                    waiting = self._trace_output(session, raw)
+                for text in parser.feed(raw.decode("utf-8", errors="replace")):
+                    session.log.append(text)
+            for text in parser.flush():
+                session.log.append(text)
+        finally:
+            session.proc.stdout.close()
+            session.log.close()
+
+    def _trace_output(self, session, raw):
+        now = time.perf_counter()
+        if session.first_output is None:
+            session.first_output = now - session.launch_t0
+            TRACER.record("game.first_output", session.launch_t0, now, "game", {"pid": session.pid})
+        if not GAME_READY_RE.search(raw.decode("utf-8", errors="replace")):
+            return True
+        session.ready = now - session.launch_t0
+        TRACER.record("game.ready", session.launch_t0, now, "game", {"pid": session.pid})
+        self._record_history(session)
+        return False
+
+    def _record_history(self, session):
+        with self._trace_lock:
+            if session.traced:
+                return
+            session.traced = True
+        spans = [s for s in TRACER.since(session.launch_t0, ("launch", "install", "game"))
+                 if (s[5] or {}).get("pid", session.pid) == session.pid]
+        record_trace_history("launch", spans, version=session.version_id, ready=session.ready is not None)
+
+    def _watch(self, session):
+        code = session.proc.wait()
+        session.runtime = time.monotonic() - session.started
+        session.exit_code = code
+        TRACER.record("game.session", session.launch_t0, time.perf_counter(), "game",
+                      {"pid": session.pid, "exit_code": code})
+        self._record_history(session)
+        self._exited.emit(session)
+
+    def _on_exited(self, session):
+        self.sessions.pop(session.pid, None)
+        self.session_finished.emit(session)
+
+
+CLI_COMMANDS = ("install", "verify", "list", "launch", "serve", "history")
+
+
+def _cli_progress(label):
+    width = [0]
+
+    def show(info):
+        line = f"{label}: {format_progress(info)}"
+        print("\r" + line.ljust(width[0]), end="", file=sys.stderr, flush=True)
+        width[0] = len(line)
+
+    return {"setInfo": show}
+
+
+def _cli_install(args, mc_dir):
+    engine = DownloadEngine(jobs=args.jobs, store=default_store())
+    t0 = time.perf_counter()
+    try:
+        install_versions(args.versions, mc_dir, _cli_progress("Installing"), engine)
+    except (DownloadError, OSError, http.client.HTTPException) as e:
+        print(f"\nInstall failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        engine.close()
+    print(f"\nInstalled {', '.join(args.versions)} in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    return 0
+
+
+def _cli_verify(args, mc_dir):
+    versions = args.versions or sorted(_scan_local_versions(mc_dir))
+    bad = []
+    for version_id in versions:
+        if is_install_intact(version_id, mc_dir):
+            status = "ok"
+        else:
+            status = "broken" if load_integrity_index(version_id, mc_dir) else "unverified"
+            bad.append(version_id)
+        print(f"{version_id}\t{status}")
+    if bad and args.repair:
+        return _cli_install(argparse.Namespace(versions=bad, jobs=args.jobs), mc_dir)
+    return 1 if bad else 0
+
+
+def _cli_list(args, mc_dir):
+    manifest = {}
+    if not args.local:
+        manifest = load_manifest_cache()
+        if manifest_is_stale(manifest):
+            try:
+                manifest = refresh_manifest_cache()
+            except OSError as e:
+                print(f"Could not refresh version manifest: {e}", file=sys.stderr)
+    for item in get_available_versions(manifest, mc_dir):
+        if args.local and not item["local"] or args.type and item["type"] != args.type:
+            continue
+        print(f"{item['id']}\t{item['type'] or '-'}\t{'local' if item['local'] else 'remote'}")
+    return 0
+
+
+def _cli_launch(args, mc_dir):
+    username = args.username or STATE.config("username")
+    if not username:
+        print("A username is required (--username)", file=sys.stderr)
+        return 2
+    try:
+        command = build_launch_command(username, args.version, STATE.config("java_path"), STATE.config("jvm_args"),
+                                       STATE.config("jvm_profile"), mc_dir=mc_dir)
+    except (DownloadError, OSError, http.client.HTTPException) as e:
+        print(f"Launch failed: {e}", file=sys.stderr)
+        return 1
+    STATE.mark_played(args.version)
+    STATE.flush()
+    record_trace_history("launch", TRACER.since(0, ("launch", "install")), version=args.version, ready=False)
+    return subprocess.call(command, cwd=mc_dir)
+
+
+def _cli_serve(args, mc_dir):
+    cache = MirrorCache(args.cache_dir, upstream=args.upstream or "", hosts=MIRROR_HOSTS + tuple(args.allow_host),
+                        jobs=args.jobs)
+    server = serve_mirror(cache, args.bind, args.port)
+    print(f"Mirror listening on http://{args.bind}:{server.server_port}, caching in {cache.root}", file=sys.stderr)
+    print(f"Point clients at it with --mirror http://<this-host>:{server.server_port} "
+          f"or the Mirror field in Settings", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        cache.close()
+        print(f"{cache.stats['hits']} hits, {cache.stats['misses']} misses, "
+              f"{cache.stats['upstream_bytes'] / 1e6:.1f} MB from upstream, "
+              f"{cache.stats['served_bytes'] / 1e6:.1f} MB served", file=sys.stderr)
+    return 0
+
+
+def _cli_history(args, mc_dir):
+    summary = summarize_trace_history(args.kind)
+    if not summary:
+        print("No trace history recorded yet", file=sys.stderr)
+        return 1
+    print(f"{'phase':<28}{'runs':>6}{'median':>12}{'p95':>12}{'max':>12}")
+    for name, stats in sorted(summary.items(), key=lambda item: -item[1]["median"]):
+        print(f"{name:<28}{stats['count']:>6}{stats['median']:>9.1f} ms{stats['p95']:>9.1f} ms{stats['max']:>9.1f} ms")
+    return 0
+
+
+def run_cli(argv):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--instance", default=None, help="instance name (default: the one selected in Settings)")
+    common.add_argument("--mirror", default=None, help="mirror base URL serving /<host>/<path> (overrides Settings)")
+    common.add_argument("--trace", metavar="FILE", help="write a Chrome trace (chrome://tracing, Perfetto) on exit")
+    parser = argparse.ArgumentParser(prog="AsphaltLauncher", description="Asphalt Launcher command line")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("install", parents=[common], help="install one or more versions")
+    p.add_argument("versions", nargs="+")
+    p.add_argument("-j", "--jobs", type=int, default=16, help="parallel downloads shared by all versions")
+    p.set_defaults(handler=_cli_install)
+    p = sub.add_parser("verify", parents=[common], help="check installed versions")
+    p.add_argument("versions", nargs="*", help="default: every local version")
+    p.add_argument("--repair", action="store_true", help="reinstall versions that fail the check")
+    p.add_argument("-j", "--jobs", type=int, default=16)
+    p.set_defaults(handler=_cli_verify)
+    p = sub.add_parser("list", parents=[common], help="list available versions")
+    p.add_argument("--local", action="store_true", help="only installed versions")
+    p.add_argument("--type", choices=("release", "snapshot", "old_beta", "old_alpha"))
+    p.set_defaults(handler=_cli_list)
+    p = sub.add_parser("launch", parents=[common], help="install if needed and start a version")
+    p.add_argument("version")
+    p.add_argument("-u", "--username")
+    p.set_defaults(handler=_cli_launch)
+    p = sub.add_parser("serve", parents=[common], help="run a caching download mirror for other machines")
+    p.add_argument("--bind", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--cache-dir", default=MIRROR_CACHE_DIR)
+    p.add_argument("--upstream", help="fetch through another mirror instead of Mojang directly")
+    p.add_argument("--allow-host", action="append", default=[], help="extra upstream host to mirror")
+    p.add_argument("-j", "--jobs", type=int, default=16)
+    p.set_defaults(handler=_cli_serve)
+    p = sub.add_parser("history", parents=[common], help="summarise recorded phase timings")
+    p.add_argument("--kind", choices=("startup", "launch", "install"), default="launch")
+    p.set_defaults(handler=_cli_history)
+    args = parser.parse_args(argv)
+    if args.mirror is not None:
+        os.environ["ASPHALT_MIRROR"] = args.mirror
+    mc_dir = get_minecraft_dir(args.instance)
+    os.makedirs(mc_dir, exist_ok=True)
+    try:
+        return args.handler(args, mc_dir)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        STATE.flush()
+        if args.trace:
+            TRACER.export(args.trace)
+
+
+# Headless commands stop here, before QtWidgets/QtGui (and the display libraries they link) are loaded.
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+    sys.exit(run_cli(sys.argv[1:]))
+
+from PySide6.QtWidgets import (
+    QApplication, QCheckBox, QComboBox, QDialog, QDialogButtonBox, QFileDialog, QFrame,
+    QGridLayout, QHBoxLayout, QLabel, QLineEdit, QMessageBox,
+    QPlainTextEdit, QProgressBar, QPushButton, QSlider, QSpinBox, QTextEdit,
+    QVBoxLayout, QWidget
+)
+from PySide6.QtGui import QIcon, QPainter, QPixmap
+
+_STARTUP_IMPORTED = time.perf_counter()
+
+
+class BackgroundWidget(QWidget):
+    def __init__(self, pixmap, parent=None):
+        super().__init__(parent)
+        self.pixmap = pixmap
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawPixmap(self.rect(), self.pixmap)
+
+
+class GameLogDialog(QDialog):
+    def __init__(self, parent, log):
+        super().__init__(parent)
+        self.setWindowTitle("Game Log")
+        self.resize(760, 420)
+        self.log = log
+        self._seq = 0
+        layout = QVBoxLayout(self)
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setMaximumBlockCount(GAME_LOG_LINES)
+        self.view.setStyleSheet("font-family: Consolas, monospace; font-size: 11px;")
+        layout.addWidget(self.view)
+        self._timer = QTimer(self)
+        self._timer.setInterval(250)
+        self._timer.timeout.connect(self._drain)
+        self._timer.start()
+        self._drain()
+
+    def _drain(self):
+        self._seq, lines = self.log.lines_since(self._seq)
+        if lines:
+            self.view.appendPlainText("\n".join(lines))
+
+
+class JvmArgsDialog(QDialog):
+    def __init__(self, parent=None, current=None):
+        super().__init__(parent)
+        self.setWindowTitle("Custom JVM Arguments")
+        self.setFixedSize(500, 300)
+        layout = QVBoxLayout(self)
+        self.text = QTextEdit()
+        self.text.setPlainText("\n".join(current or []))
+        layout.addWidget(self.text)
+        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        btns.accepted.connect(self.accept)
+        btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
+
+    def args(self):
+        txt = self.text.toPlainText().strip()
+        return [line.strip() for line in txt.splitlines() if line.strip()] if txt else []
+
+    def accept(self):
+        errors = validate_jvm_args(self.args())
+        if errors:
+            QMessageBox.warning(self, "Invalid JVM Arguments", "\n".join(errors))
+            return
+        super().accept()
+
+
+class JavaPickerDialog(QDialog):
+    def __init__(self, parent=None, current="", version_id=None):
+        super().__init__(parent)
+        self.setWindowTitle("Select Java Executable")
+        self.setFixedSize(460, 170 if version_id else 140)
+        layout = QVBoxLayout(self)
+        self.runtimes = QComboBox()
+        self.runtimes.addItem("Automatic (best match per version)", "")
+        for runtime in sorted(JAVA_RUNTIMES.runtimes(), key=lambda r: (-r.major, r.path)):
+            self.runtimes.addItem(f"Java {runtime.version} ({runtime.vendor}, {runtime.arch}) - {runtime.path}",
+                                  runtime.path)
+        JAVA_RUNTIMES.refresh()
+        self.runtimes.activated.connect(lambda i: self.path.setText(self.runtimes.itemData(i)))
+        layout.addWidget(self.runtimes)
+        self.path = QLineEdit(current or "")
+        self.path.setPlaceholderText("Automatic")
+        browse = QPushButton("Browse...")
+        browse.clicked.connect(self._browse)
+        row = QHBoxLayout()
+        row.addWidget(self.path)
+        row.addWidget(browse)
+        layout.addLayout(row)
+        self.only_version = None
+        if version_id:
+            self.only_version = QCheckBox(f"Use only for {version_id}")
+            layout.addWidget(self.only_version)
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        btns.accepted.connect(self.accept)
+        btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
+        self._runtime = None
+
+    def _browse(self):
+        file, _ = QFileDialog.getOpenFileName(
+            self, "Select Java executable", "", "Executables (*.exe)" if os.name == 'nt' else "")
+        if file:
+            self.path.setText(file)
+
+    def accept(self):
+        path = self.path.text().strip()
+        self._runtime = JAVA_RUNTIMES.probe(path) if path else None
+        if path and self._runtime is None:
+            self.status.setText("Not a working Java executable")
+            self.status.setStyleSheet("color: #ff6666;")
+            return
+        super().accept()
+
+    def java_path(self):
+        return self._runtime.path if self._runtime else None
+
+    def per_version(self):
+        return self.only_version is not None and self.only_version.isChecked()
+
+
+class InstallWorker(QObject):
+    status = Signal(str)
+    info = Signal(dict)
+    finished = Signal()
+    failed = Signal(str)
+    cancelled = Signal()
+    done = Signal()
+
+    def __init__(self, version_id, mc_dir):
+        super().__init__()
+        self.version_id = version_id
+        self.mc_dir = mc_dir
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            install_version(
+                self.version_id, self.mc_dir,
+                callback={"setStatus": self.status.emit, "setInfo": self.info.emit},
+                cancel=self.cancel_event
+            )
+            self.finished.emit()
+        except InstallCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.done.emit()
+
+
+class ManifestWorker(QObject):
+    loaded = Signal(object)
+    failed = Signal(str)
+    finished = Signal()
+
+    def __init__(self, force=False):
+        super().__init__()
+        self.force = force
+
+    def run(self):
+        try:
+            with TRACER.span("refresh.local_index", "refresh"):
+                get_local_index().refresh()
+            with TRACER.span("refresh.manifest_cache", "refresh"):
+                cache = load_manifest_cache()
+            self.loaded.emit(cache)
+            if self.force or manifest_is_stale(cache):
+                with TRACER.span("refresh.manifest_fetch", "refresh"):
+                    manifest = refresh_manifest_cache()
+                self.loaded.emit(manifest)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
+
+
+class PrefetchWorker(QObject):
+    finished = Signal(list)
+
+    def __init__(self, manifest, mc_dir):
+        super().__init__()
+        self.manifest = manifest
+        self.mc_dir = mc_dir
+        self.cancel_event = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def pause(self):
+        self.gate.clear()
+
+    def resume(self):
+        self.gate.set()
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.gate.set()
+
+    def run(self):
+        fetched = []
+        engine = DownloadEngine(jobs=STATE.config("prefetch_jobs", 2), store=default_store())
+        rate = STATE.config("prefetch_rate", 0)
+        engine.limiter = RateLimiter(rate) if rate else None
+        engine.gate = self.gate
+        try:
+            fetched = prefetch_versions(predict_versions(self.manifest), self.mc_dir, engine,
+                                        self.manifest, self.cancel_event)
+        except Exception as e:
+            print(f"Prefetch failed: {e}")
+        finally:
+            engine.close()
+            self.finished.emit(fetched)
+
+
+class VersionListModel(QAbstractListModel):
+    IdRole = Qt.UserRole + 1
+    TypeRole = Qt.UserRole + 2
+    LocalRole = Qt.UserRole + 3
+    RankRole = Qt.UserRole + 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return row["label"]
+        if role == self.IdRole:
+            return row["id"]
+        if role == self.TypeRole:
+            return row["type"]
+        if role == self.LocalRole:
+            return row["local"]
+        if role == self.RankRole:
+            return row["rank"]
+        return None
+
+    def set_versions(self, items):
+        new = {item["id"]: item for item in items}
+        row = len(self._rows) - 1
+        while row >= 0:
+            if self._rows[row]["id"] in new:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and self._rows[row]["id"] not in new:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, end)
+            del self._rows[row + 1:end + 1]
+            self.endRemoveRows()
+        changed = []
+        for i, current in enumerate(self._rows):
+            updated = new.pop(current["id"])
+            if updated != current:
+                self._rows[i] = updated
+                changed.append(i)
+        if changed:
+            self.dataChanged.emit(self.index(changed[0]), self.index(changed[-1]))
+        if new:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(new) - 1)
+            self._rows.extend(new.values())
+            self.endInsertRows()
+
+
+class VersionFilterProxy(QSortFilterProxyModel):
+    TYPE_FILTERS = [("All", None), ("Installed", "installed"), ("Release", "release"),
+                    ("Snapshot", "snapshot"), ("Beta", "old_beta"), ("Alpha", "old_alpha")]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.type_filter = None
+        self.setSortRole(VersionListModel.RankRole)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+
+    def set_type_filter(self, kind):
+        self.type_filter = kind
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if self.type_filter == "installed":
+            if not index.data(VersionListModel.LocalRole):
+                return False
+        elif self.type_filter and index.data(VersionListModel.TypeRole) != self.type_filter:
+            return False
+        return super().filterAcceptsRow(source_row, source_parent)
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.phases = [("imports + module", _STARTUP_IMPORTED - _STARTUP_T0)]
+        self._last = _STARTUP_IMPORTED
+        TRACER.record("imports + module", _STARTUP_T0, _STARTUP_IMPORTED, "startup")
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        TRACER.record(name, self._last, now, "startup")
+        self._last = now
+
+    def total(self):
+        return self._last - _STARTUP_T0
+
+    def report(self, out=None):
+        out = out or sys.stderr
+        for name, secs in self.phases:
+            print(f"{name:<24}{secs * 1000:9.1f} ms", file=out)
+        print(f"{'total':<24}{self.total() * 1000:9.1f} ms", file=out)
+
+
+class _FirstPaintFilter(QObject):
+    painted = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._seen = False
+
+    def eventFilter(self, obj, event):
+        if not self._seen and event.type() == QEvent.Paint:
+            self._seen = True
+            self.painted.emit()
+        return False
+
+
+class NetworkMonitor(QObject):
+    state_changed = Signal(bool)
+    recheck_requested = Signal()
+    failure_reported = Signal()
+    stop_requested = Signal()
+
+    def __init__(self, host="launchermeta.mojang.com", port=443, timeout=2.0,
+                 interval=30.0, min_backoff=2.0, max_backoff=60.0):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.interval = interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.online = None
+        self._backoff = min_backoff
+        self._failure_backoff = min_backoff
+        self._timer = None
+        self.recheck_requested.connect(self.recheck)
+        self.failure_reported.connect(self.report_failure)
+        self.stop_requested.connect(self.stop)
+
+    def start(self):
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+        self._tick()
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.stop()
+        QThread.currentThread().quit()
+
+    def recheck(self):
+        self._backoff = self._failure_backoff = self.min_backoff
+        self.online = None
+        if self._timer is not None:
+            self._timer.stop()
+            self._tick()
+
+    def report_failure(self):
+        self.online = None
+        delay = self._failure_backoff
+        self._failure_backoff = min(self._failure_backoff * 2, self.max_backoff)
+        if self._timer is not None:
+            self._timer.start(int(delay * 1000))
+
+    def probe(self):
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                return True
+        except OSError:
+            return False
+
+    def next_delay(self, ok):
+        if ok:
+            self._backoff = self.min_backoff
+            return self.interval
+        delay = self._backoff
+        self._backoff = min(self._backoff * 2, self.max_backoff)
+        return delay
+
+    def _tick(self):
+        ok = self.probe()
+        if ok and self.online:
+            self._failure_backoff = self.min_backoff
+        if ok != self.online:
+            self.online = ok
+            self.state_changed.emit(ok)
+        self._timer.start(int(self.next_delay(ok) * 1000))
+
+
+class AsphaltLauncher(QWidget):
+    versions_loaded = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self.appdata_dir = get_appdata_path()
+        self.assets_dir = os.path.join(self.appdata_dir, "assets")
+        self.icon_path = os.path.join(self.assets_dir, "logo.ico")
+        self.ensure_assets_exist()
+        self.java_executable = STATE.config("java_path")
+        self.jvm_arguments = STATE.config("jvm_args")
+        self.setWindowTitle("Asphalt Launcher")
+        self.setFixedSize(880, 520)
+        self.setWindowIcon(QIcon(self.icon_path))
+        bg_path = os.path.join(self.assets_dir, "background.webp")
+        if os.path.isfile(bg_path):
+            bg_pixmap = QPixmap(bg_path)
+            bg = BackgroundWidget(bg_pixmap, self)
+            bg.setGeometry(self.rect())
+            bg.lower()
+        else:
+            self.setStyleSheet("background-color: #2c2c2c; color: white; font-family: 'Segoe UI';")
+        root_v = QVBoxLayout(self)
+        root_v.setContentsMargins(0, 0, 0, 0)
+        top_bar = QHBoxLayout()
+        top_bar.setContentsMargins(16, 12, 16, 8)
+        username_label = QLabel("Username:")
+        username_label.setStyleSheet("color:#fff; font-size:12px; font-weight:bold;")
+        top_bar.addWidget(username_label)
+        self.username_input = QLineEdit()
+        self.username_input.setPlaceholderText("Enter your Minecraft username")
+        self.username_input.setText(STATE.config("username", ""))
+        self.username_input.setFixedWidth(300)
+        top_bar.addWidget(self.username_input)
+        top_bar.addStretch()
+        self.session_label = QLabel("")
+        self.session_label.setStyleSheet("color:#fff; font-size:12px;")
+        top_bar.addWidget(self.session_label)
+        self.btn_log = QPushButton("Log")
+        self.btn_log.setToolTip("Show the game log")
+        self.btn_log.setStyleSheet("background-color:#888; padding:6px 12px; font-size:12px;")
+        self.btn_log.clicked.connect(self.open_game_log)
+        self.btn_log.hide()
+        top_bar.addWidget(self.btn_log)
+        self.btn_settings = QPushButton("⚙")
+        self.btn_settings.setStyleSheet("background-color:#888; padding:6px 12px; font-size:12px;")
+        self.btn_settings.clicked.connect(self.open_settings)
+        top_bar.addWidget(self.btn_settings)
+        self.username_input.setFixedHeight(self.btn_settings.sizeHint().height())
+        root_v.addLayout(top_bar)
+        root_v.addStretch()
+        center_h = QHBoxLayout()
+        center_h.addStretch()
+        center_v = QVBoxLayout()
+        center_v.setAlignment(Qt.AlignCenter)
+        self.version_model = VersionListModel(self)
+        self.version_proxy = VersionFilterProxy(self)
+        self.version_proxy.setSourceModel(self.version_model)
+        self.version_proxy.sort(0)
+        self.version_dropdown = QComboBox()
+        self.version_dropdown.setModel(self.version_proxy)
+        self.version_dropdown.setMaxVisibleItems(20)
+        self._online = True
+        self.version_dropdown.setFixedWidth(280)
+        self.version_dropdown.setFixedHeight(42)
+        self.version_search = QLineEdit()
+        self.version_search.setPlaceholderText("Search versions…")
+        self.version_search.setClearButtonEnabled(True)
+        self.version_search.setFixedWidth(280)
+        self.version_search.textChanged.connect(self._apply_version_filter)
+        self.version_type = QComboBox()
+        for label, kind in VersionFilterProxy.TYPE_FILTERS:
+            self.version_type.addItem(label, kind)
+        self.version_type.currentIndexChanged.connect(self._apply_version_filter)
+        self.retry_btn = QPushButton("⟳")
+        self.retry_btn.setFixedSize(28, 42)
+        self.retry_btn.setToolTip("Refresh version list")
+        self.retry_btn.clicked.connect(self._retry_versions)
+        self.retry_btn.hide()
+        self.manifest = {}
+        self._manifest_thread = None
+        self._versions_loaded = False
+        self._offline_box = None
+        self._installing = False
+        self._install_progress = None
+        self._prefetch_thread = None
+        self._prefetch_worker = None
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(PREFETCH_IDLE_MS)
+        self._prefetch_timer.timeout.connect(self._start_prefetch)
+        self.version_dropdown.setPlaceholderText("Loading versions…")
+        self.version_dropdown.setCurrentIndex(-1)
+        self.start_btn = QPushButton("START")
+        self.start_btn.setFixedSize(180, 42)
+        self.start_btn.setStyleSheet("background-color:#6ab04c; font-size:17px; font-weight:bold;")
+        self.start_btn.clicked.connect(self.launch_game)
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(self.version_search)
+        filter_row.addWidget(self.version_type)
+        filter_row.addStretch()
+        row = QHBoxLayout()
+        row.addWidget(self.version_dropdown)
+        row.addWidget(self.retry_btn)
+        row.addSpacing(12)
+        row.addWidget(self.start_btn)
+        center_v.addLayout(filter_row)
+        center_v.addLayout(row)
+        center_h.addLayout(center_v)
+        center_h.addStretch()
+        root_v.addLayout(center_h)
+        root_v.addStretch()
+        self.supervisor = SessionSupervisor(self, GAME_LOG_DIR if STATE.config("game_logs", True) else None)
+        self.supervisor.session_started.connect(self._on_session_started)
+        self.supervisor.session_finished.connect(self._on_session_finished)
+        self._network_thread = QThread(self)
+        probe = urllib.parse.urlsplit(mirror_url(MANIFEST_URL))
+        self.network_monitor = NetworkMonitor(probe.hostname, probe.port or (443 if probe.scheme == "https" else 80))
+        self.network_monitor.moveToThread(self._network_thread)
+        self._network_thread.started.connect(self.network_monitor.start)
+        self.network_monitor.state_changed.connect(self._on_network_changed)
+        self._network_thread.start()
+        QApplication.instance().aboutToQuit.connect(self._stop_network_monitor)
+        QApplication.instance().aboutToQuit.connect(lambda: self._cancel_prefetch(wait=True))
+        QApplication.instance().aboutToQuit.connect(STATE.flush)
+        footer = QLabel("Asphalt Launcher - A Launcher for Minecraft")
+        footer.setAlignment(Qt.AlignCenter)
+        footer.setStyleSheet("color:#fff; font-size:12px; font-weight:bold;")
+        root_v.addWidget(footer)
+        self.local_index = get_local_index()
+        self._changed_dirs = set()
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.directoryChanged.connect(self._on_local_dir_changed)
+        self._local_timer = QTimer(self)
+        self._local_timer.setSingleShot(True)
+        self._local_timer.setInterval(300)
+        self._local_timer.timeout.connect(self._apply_local_changes)
+        QTimer.singleShot(0, self._refresh_manifest)
+
+    def open_settings(self):
+        SettingsDialog(self, self.java_executable, self.jvm_arguments).exec()
+
+    def edit_jvm_args(self):
+        dlg = JvmArgsDialog(self, self.jvm_arguments)
+        if dlg.exec():
+            self.jvm_arguments = dlg.args()
+            STATE.update_config(username=self.username_input.text(), jvm_args=self.jvm_arguments,
+                                java_path=self.java_executable)
+
+    def select_java(self):
+        dlg = JavaPickerDialog(self, self.java_executable or "")
+        if dlg.exec():
+            self.java_executable = dlg.java_path()
+            STATE.update_config(username=self.username_input.text(), jvm_args=self.jvm_arguments,
+                                java_path=self.java_executable)
+
+    def open_folder(self, path):
+        if os.path.isdir(path):
+            os.startfile(path)
+
+    def _populate_dropdown(self, force_refresh=False):
+        if self._online:
+            self.retry_btn.hide()
+            if force_refresh or manifest_is_stale(self.manifest):
+                self._refresh_manifest(force_refresh)
+        with TRACER.span("refresh.populate", "refresh"):
+            items = get_available_versions(self.manifest if self._online else {})
+            first = self.version_model.rowCount() == 0
+            self.version_model.set_versions(items)
+        if first or self.version_dropdown.currentIndex() < 0:
+            self.version_dropdown.setCurrentIndex(0 if self.version_proxy.rowCount() else -1)
+        if not self._online:
+            self.version_dropdown.setPlaceholderText("No versions found (offline)")
+            if not items:
+                if self._offline_box is None:
+                    self._offline_box = QMessageBox(
+                        QMessageBox.Warning, "Offline",
+                        "No local Minecraft versions found and you appear to be offline.\n"
+                        "Connect to the internet or place a version manually in .minecraft\\versions",
+                        QMessageBox.Ok, self
+                    )
+                    self._offline_box.finished.connect(lambda _: setattr(self, "_offline_box", None))
+                    self._offline_box.open()
+            self.retry_btn.show()
+
+    def _apply_version_filter(self):
+        self.version_proxy.set_type_filter(self.version_type.currentData())
+        self.version_proxy.setFilterFixedString(self.version_search.text())
+        if self.version_dropdown.currentIndex() < 0 and self.version_proxy.rowCount():
+            self.version_dropdown.setCurrentIndex(0)
+
+    def _retry_versions(self):
+        self._online = True
+        self._populate_dropdown(force_refresh=True)
+        self.network_monitor.recheck_requested.emit()
+
+    def _refresh_manifest(self, force=False):
+        if self._manifest_thread is not None:
+            return
+        self._manifest_thread = QThread()
+        self._manifest_worker = ManifestWorker(force)
+        self._manifest_worker.moveToThread(self._manifest_thread)
+        self._manifest_thread.started.connect(self._manifest_worker.run)
+        self._manifest_worker.loaded.connect(self._on_manifest_loaded)
+        self._manifest_worker.failed.connect(self._on_manifest_failed)
+        self._manifest_worker.finished.connect(self._manifest_thread.quit)
+        self._manifest_thread.finished.connect(self._on_manifest_thread_done)
+        self._manifest_thread.start()
+
+    def _on_manifest_thread_done(self):
+        self._manifest_thread.deleteLater()
+        self._manifest_worker.deleteLater()
+        self._manifest_thread = None
+
+    def _on_manifest_loaded(self, manifest):
+        self.manifest = manifest
+        self._populate_dropdown()
+        if not self._versions_loaded:
+            self._versions_loaded = True
+            self._watch_local_versions()
+            JAVA_RUNTIMES.refresh()
+            self._prefetch_timer.start()
+            self.versions_loaded.emit()
+
+    def _watch_local_versions(self):
+        index = self.local_index
+        if os.path.isdir(index.versions_dir):
+            wanted = {index.versions_dir}
+            wanted.update(os.path.join(index.versions_dir, name) for name in index.versions)
+        else:
+            wanted = {os.path.dirname(index.versions_dir)} if os.path.isdir(os.path.dirname(index.versions_dir)) else set()
+        current = set(self._fs_watcher.directories())
+        if current - wanted:
+            self._fs_watcher.removePaths(list(current - wanted))
+        if wanted - current:
+            self._fs_watcher.addPaths(list(wanted - current))
+        index.watched = index.versions_dir in self._fs_watcher.directories()
+
+    def _on_local_dir_changed(self, path):
+        self._changed_dirs.add(os.path.abspath(path))
+        self._local_timer.start()
+
+    def _apply_local_changes(self):
+        index = self.local_index
+        changed_dirs, self._changed_dirs = self._changed_dirs, set()
+        if index.versions_dir in changed_dirs or os.path.dirname(index.versions_dir) in changed_dirs:
+            changed = index.rescan()
+        else:
+            changed = False
+            for path in changed_dirs:
+                changed = index.update(os.path.basename(path)) or changed
+        self._watch_local_versions()
+        if changed:
+            self._populate_dropdown()
+
+    def switch_instance(self, name):
+        if name == (STATE.config("instance") or ""):
+            return
+        STATE.update_config(instance=name)
+        os.makedirs(get_minecraft_dir(), exist_ok=True)
+        self.local_index.watched = False
+        self._changed_dirs.clear()
+        self.local_index = get_local_index()
+        self.local_index.watched = False
+        self.local_index.refresh()
+        self._watch_local_versions()
+        self._populate_dropdown()
+
+    def _on_manifest_failed(self, msg):
+        self._online = False
+        self._populate_dropdown()
+        self.network_monitor.failure_reported.emit()
+
+    def _on_network_changed(self, online):
+        if online != self._online:
+            self._online = online
+            self._populate_dropdown()
+
+    def _start_prefetch(self):
+        if (not STATE.config("prefetch") or not self._online or self._installing
+                or self.supervisor.sessions or self._prefetch_thread is not None):
+            return
+        self._prefetch_thread = QThread()
+        self._prefetch_worker = PrefetchWorker(self.manifest, get_minecraft_dir())
+        self._prefetch_worker.moveToThread(self._prefetch_thread)
+        self._prefetch_thread.started.connect(self._prefetch_worker.run)
+        self._prefetch_worker.finished.connect(self._prefetch_thread.quit, Qt.DirectConnection)
+        self._prefetch_worker.finished.connect(self._on_prefetch_done)
+        self._prefetch_thread.start()
+
+    def _on_prefetch_done(self, fetched):
+        self._prefetch_thread.wait()
+        self._prefetch_thread.deleteLater()
+        self._prefetch_worker.deleteLater()
+        self._prefetch_thread = self._prefetch_worker = None
+        if fetched:
+            self.session_label.setText(f"Downloaded in the background: {', '.join(fetched)}")
+            self._populate_dropdown()
+
+    def _cancel_prefetch(self, wait=False):
+        self._prefetch_timer.stop()
+        if self._prefetch_worker is not None:
+            self._prefetch_worker.cancel()
+            if wait:
+                self._prefetch_thread.wait(5000)
+
+    def _stop_network_monitor(self):
+        if self._network_thread.isRunning():
+            self.network_monitor.stop_requested.emit()
+            self._network_thread.wait()
+
+    def closeEvent(self, event):
+        self._stop_network_monitor()
+        super().closeEvent(event)
+
+    def launch_game(self):
+        launch_t0 = time.perf_counter()
+        username = self.username_input.text().strip()
+        version_id = self.version_dropdown.currentData(VersionListModel.IdRole)
+        if not version_id or self._installing:
+            return
+        if not username:
+            dlg = QDialog(self)
+            dlg.setWindowTitle("Attention")
+            dlg.setFixedSize(300, 80)
+            dlg.setModal(True)
+            lay = QVBoxLayout(dlg)
+            lay.addWidget(QLabel("Username is required to launch Minecraft"), alignment=Qt.AlignCenter)
+            ok = QPushButton("OK")
+            ok.clicked.connect(dlg.accept)
+            lay.addWidget(ok, alignment=Qt.AlignCenter)
+            dlg.exec()
+            return
+        STATE.update_config(username=username, jvm_args=self.jvm_arguments, java_path=self.java_executable)
+        mc_dir = get_minecraft_dir()
+        with TRACER.span("launch.verify", "launch"):
+            already_installed = is_install_intact(version_id, mc_dir)
+        if not already_installed:
+            self._cancel_prefetch()
+            progress = QDialog(self)
+            progress.setWindowTitle("Downloading…")
+            progress.setFixedSize(380, 170)
+            progress.setModal(True)
+            layout = QVBoxLayout(progress)
+            bar = QProgressBar()
+            bar.setRange(0, 0)
+            phase = QLabel("Preparing download")
+            detail = QLabel("")
+            layout.addWidget(QLabel("Minecraft will launch after installation."), alignment=Qt.AlignCenter)
+            layout.addWidget(phase)
+            layout.addWidget(bar)
+            layout.addWidget(detail)
+            cancel_btn = QPushButton("Cancel")
+            cancel_btn.clicked.connect(progress.reject)
+            layout.addWidget(cancel_btn, alignment=Qt.AlignCenter)
+            self._install_progress = (progress, bar, detail)
+
+            self.thread = QThread()
+            self.worker = InstallWorker(version_id, mc_dir)
+            self.worker.moveToThread(self.thread)
+            self.thread.started.connect(self.worker.run)
+            self.worker.status.connect(phase.setText)
+            self.worker.info.connect(self._on_install_info)
+            self.worker.finished.connect(progress.accept)
+            self.worker.failed.connect(self._on_install_failed)
+            progress.rejected.connect(self.worker.cancel, Qt.DirectConnection)
+            self.worker.done.connect(self.thread.quit)
+            self.worker.done.connect(self.worker.deleteLater)
+            self.worker.done.connect(lambda: setattr(self, "_installing", False))
+            self.thread.finished.connect(self.thread.deleteLater)
+            self._installing = True
+            self.thread.start()
+            progress.exec()
+            if progress.result() != QDialog.Accepted:
+                return
+        try:
+            command = build_launch_command(username, version_id,
+                                           java_executable=self.java_executable,
+                                           jvm_args=self.jvm_arguments,
+                                           jvm_profile=STATE.config("jvm_profile"),
+                                           mc_dir=mc_dir, verified=True)
+            self.supervisor.start(version_id, command, mc_dir, launch_t0)
+        except Exception as e:
+            print(f"Launch failed: {e}")
+            self._populate_dropdown()
+
+    def _on_install_info(self, info):
+        _, bar, detail = self._install_progress
+        if info["total_bytes"]:
+            bar.setRange(0, 1000)
+            bar.setValue(min(int(info["bytes"] * 1000 / info["total_bytes"]), 1000))
+        elif info["total_files"]:
+            bar.setRange(0, info["total_files"])
+            bar.setValue(info["files"])
+        detail.setText(format_progress(info))
+
+    def _on_install_failed(self, message):
+        self._install_progress[0].reject()
+        QMessageBox.critical(self, "Download Failed", message)
+
+    def _on_session_started(self, session):
+        STATE.mark_played(session.version_id)
+        self._prefetch_timer.stop()
+        if self._prefetch_worker is not None:
+            self._prefetch_worker.pause()
+        self._update_session_label()
+        self.btn_log.show()
+        self.showMinimized()
+
+    def _update_session_label(self, finished=None):
+        running = sorted(session.version_id for session in self.supervisor.sessions.values())
+        if running:
+            self.session_label.setText(f"Running: {', '.join(running)}")
+        elif finished is not None:
+            self.session_label.setText(f"{finished.version_id} exited with code {finished.exit_code} "
+                                       f"after {finished.runtime:.0f}s")
+
+    def _on_session_finished(self, session):
+        self._update_session_label(session)
+        if not self.supervisor.sessions:
+            self.showNormal()
+            self.activateWindow()
+            self._populate_dropdown()
+            if self._prefetch_worker is not None:
+                self._prefetch_worker.resume()
+            else:
+                self._prefetch_timer.start()
+            if session.exit_code != 0:
+                self.open_game_log()
+
+    def open_game_log(self):
+        session = self.supervisor.last_session
+        if session is None:
+            QMessageBox.information(self, "Game Log", "No game has been started yet.")
+            return
+        GameLogDialog(self, session.log).show()
+
+    def ensure_assets_exist(self):
+        os.makedirs(self.assets_dir, exist_ok=True)
+        for asset in ("logo.ico", "background.webp"):
+            dst = os.path.join(self.assets_dir, asset)
+            if not os.path.exists(dst):
+                src = resource_path(f"assets/{asset}")
+                if os.path.exists(src):
+                    shutil.copy(src, dst)
+
+
+class SettingsDialog(QDialog):
+    def __init__(self, parent, java_executable, jvm_arguments):
+        super().__init__(parent)
+        self.setWindowTitle("Settings")
+        self.setFixedSize(380, 450)
+        self.setModal(True)
+        self.parent_window = parent
+        self.jvm_arguments = list(jvm_arguments or [])
+        max_mb = max(host_resources()[0] >> 20, 1024)
+        self.min_spin = QSpinBox()
+        self.min_spin.setRange(512, max_mb)
+        self.min_spin.setSingleStep(256)
+        self.min_spin.setValue(2048)
+        self.max_spin = QSpinBox()
+        self.max_spin.setRange(512, max_mb)
+        self.max_spin.setSingleStep(256)
+        self.max_spin.setValue(4096)
+        self.min_slider = QSlider(Qt.Horizontal)
+        self.min_slider.setRange(512, max_mb)
+        self.min_slider.setSingleStep(256)
+        self.min_slider.setPageStep(1024)
+        self.min_slider.setValue(2048)
+        self.max_slider = QSlider(Qt.Horizontal)
+        self.max_slider.setRange(512, max_mb)
+        self.max_slider.setSingleStep(256)
+        self.max_slider.setPageStep(1024)
+        self.max_slider.setValue(4096)
+        self.min_spin.valueChanged.connect(self.min_slider.setValue)
+        self.min_slider.valueChanged.connect(self.min_spin.setValue)
+        self.max_spin.valueChanged.connect(self.max_slider.setValue)
+        self.max_slider.valueChanged.connect(self.max_spin.setValue)
+        self._load_ram_from_args()
+        self.min_spin.valueChanged.connect(self._write_ram_to_args)
+        self.max_spin.valueChanged.connect(self._write_ram_to_args)
+        self.profile_box = QComboBox()
+        for key, (label, _) in JVM_PROFILES.items():
+            self.profile_box.addItem(label, key)
+        self.profile_box.setCurrentIndex(max(self.profile_box.findData(STATE.config("jvm_profile")), 0))
+        self.profile_box.currentIndexChanged.connect(self._profile_changed)
+        grid = QGridLayout()
+        grid.addWidget(QLabel("Min RAM (MB):"), 0, 0)
+        grid.addWidget(self.min_slider, 0, 1)
+        grid.addWidget(self.min_spin, 0, 2)
+        grid.addWidget(QLabel("Max RAM (MB):"), 1, 0)
+        grid.addWidget(self.max_slider, 1, 1)
+        grid.addWidget(self.max_spin, 1, 2)
+        self.instance_box = QComboBox()
+        self.instance_box.setEditable(True)
+        self.instance_box.addItem("default", "")
+        for name in list_instances():
+            self.instance_box.addItem(name, name)
+        self.instance_box.setCurrentIndex(max(self.instance_box.findData(STATE.config("instance") or ""), 0))
+        self.instance_box.currentIndexChanged.connect(self._instance_changed)
+        grid.addWidget(QLabel("JVM Profile:"), 2, 0)
+        grid.addWidget(self.profile_box, 2, 1, 1, 2)
+        grid.addWidget(QLabel("Instance:"), 3, 0)
+        grid.addWidget(self.instance_box, 3, 1, 1, 2)
+        self.cds_check = QCheckBox("Class data sharing (faster startup, Java 13+)")
+        self.cds_check.setChecked(STATE.config("class_data_sharing", True))
+        self.cds_check.toggled.connect(lambda on: STATE.update_config(class_data_sharing=on))
+        grid.addWidget(self.cds_check, 4, 0, 1, 3)
+        self.mirror_edit = QLineEdit()
+        mirror = STATE.config("mirror")
+        if isinstance(mirror, dict):
+            self.mirror_edit.setPlaceholderText("Per-host mapping set in launcher.json")
+            self.mirror_edit.setEnabled(False)
+        else:
+            self.mirror_edit.setText(mirror or "")
+            self.mirror_edit.setPlaceholderText("http://mirror:8080 (optional)")
+        self.mirror_edit.editingFinished.connect(lambda: STATE.update_config(mirror=self.mirror_edit.text().strip()))
+        grid.addWidget(QLabel("Mirror:"), 5, 0)
+        grid.addWidget(self.mirror_edit, 5, 1, 1, 2)
+        self.prefetch_check = QCheckBox("Prefetch likely versions when idle")
+        self.prefetch_check.setChecked(bool(STATE.config("prefetch")))
+        self.prefetch_check.toggled.connect(self._prefetch_toggled)
+        self.prefetch_rate = QSpinBox()
+        self.prefetch_rate.setRange(0, 1000)
+        self.prefetch_rate.setSuffix(" MB/s")
+        self.prefetch_rate.setSpecialValueText("No limit")
+        self.prefetch_rate.setValue(STATE.config("prefetch_rate", 0) >> 20)
+        self.prefetch_rate.valueChanged.connect(lambda mb: STATE.update_config(prefetch_rate=mb << 20))
+        grid.addWidget(self.prefetch_check, 6, 0, 1, 2)
+        grid.addWidget(self.prefetch_rate, 6, 2)
+        btn_jvm = QPushButton("Custom JVM Args")
+        btn_java = QPushButton("Select JRE")
+        btn_mc = QPushButton(".minecraft")
+        btn_launcher = QPushButton("Launcher Dir")
+        btn_log = QPushButton("Game Log")
+        btn_store = QPushButton("Clean Store")
+        for btn in (btn_jvm, btn_java, btn_mc, btn_launcher, btn_log, btn_store):
+            btn.setStyleSheet("background-color: #888888; padding: 8px; font-size: 12px;")
+        btn_grid = QGridLayout()
+        btn_grid.addWidget(btn_jvm, 0, 0)
+        btn_grid.addWidget(btn_java, 0, 1)
+        btn_grid.addWidget(btn_mc, 1, 0)
+        btn_grid.addWidget(btn_launcher, 1, 1)
+        btn_grid.addWidget(btn_log, 2, 0)
+        btn_grid.addWidget(btn_store, 2, 1)
+        close_btn = QPushButton("Close")
+        close_btn.setStyleSheet("background-color: #888888; padding: 8px; font-size: 12px;")
+        close_btn.clicked.connect(self.accept)
+        main = QVBoxLayout(self)
+        main.addLayout(grid)
+        main.addLayout(btn_grid)
+        main.addWidget(close_btn)
+        btn_jvm.clicked.connect(self._open_jvm_dialog)
+        btn_java.clicked.connect(self._open_java_dialog)
+        btn_mc.clicked.connect(lambda: self.parent_window.open_folder(get_minecraft_dir()))
+        btn_launcher.clicked.connect(lambda: self.parent_window.open_folder(self.parent_window.appdata_dir))
+        btn_log.clicked.connect(self.parent_window.open_game_log)
+        btn_store.clicked.connect(self._clean_store)
+
+    def _instance_changed(self, index):
+        if index < 0:
+            return
+        data = self.instance_box.itemData(index)
+        name = data if data is not None else re.sub(r"[^\w.\- ]", "", self.instance_box.itemText(index)).strip(" .")
+        if name.lower() == "default":
+            name = ""
+        if data is None:
+            self.instance_box.setItemData(index, name)
+            self.instance_box.setItemText(index, name or "default")
+        self.parent_window.switch_instance(name)
+
+    def _prefetch_toggled(self, on):
+        STATE.update_config(prefetch=on)
+        if on:
+            self.parent_window._prefetch_timer.start()
+        else:
+            self.parent_window._cancel_prefetch()
+
+    def _clean_store(self):
+        removed, freed = ObjectStore().gc()
+        QMessageBox.information(self, "Clean Store",
+                                f"Removed {removed} unused files ({freed / (1024 * 1024):.1f} MB freed).")
+
+    def _load_ram_from_args(self):
+        sizes = {}
+        for arg in tuned_jvm_args(STATE.config("jvm_profile"), self.jvm_arguments):
+            if arg[:4] in ("-Xms", "-Xmx"):
+                try:
+                    sizes[arg[:4]] = parse_memory_size(arg[4:]) >> 20
+                except ValueError:
+                    pass
+        for flag, spin, slider in (("-Xms", self.min_spin, self.min_slider), ("-Xmx", self.max_spin, self.max_slider)):
+            if flag in sizes:
+                for widget in (spin, slider):
+                    widget.blockSignals(True)
+                    widget.setValue(sizes[flag])
+                    widget.blockSignals(False)
+
+    def _profile_changed(self, index):
+        STATE.update_config(jvm_profile=self.profile_box.itemData(index))
+        self._load_ram_from_args()
+
+    def _write_ram_to_args(self):
+        new_args = [a for a in self.jvm_arguments if not (a.startswith("-Xms") or a.startswith("-Xmx"))]
+        new_args.append(f"-Xms{min(self.min_spin.value(), self.max_spin.value())}M")
+        new_args.append(f"-Xmx{self.max_spin.value()}M")
+        self.jvm_arguments = new_args
+        self.parent_window.jvm_arguments = new_args
+        STATE.update_config(username=self.parent_window.username_input.text(),
+                            jvm_args=self.parent_window.jvm_arguments,
+                            java_path=self.parent_window.java_executable)
+
+    def _open_jvm_dialog(self):
+        dlg = JvmArgsDialog(self, self.jvm_arguments)
+        if dlg.exec():
+            self.jvm_arguments = dlg.args()
+            self.parent_window.jvm_arguments = self.jvm_arguments
+            STATE.update_config(username=self.parent_window.username_input.text(),
+                                jvm_args=self.parent_window.jvm_arguments,
+                                java_path=self.parent_window.java_executable)
+            self._load_ram_from_args()
+
+    def _open_java_dialog(self):
+        version_id = self.parent_window.version_dropdown.currentData(VersionListModel.IdRole)
+        overrides = STATE.config("java_overrides", {})
+        current = overrides.get(version_id) or self.parent_window.java_executable or ""
+        dlg = JavaPickerDialog(self, current, version_id)
+        if dlg.exec():
+            if dlg.per_version():
+                if dlg.java_path():
+                    overrides[version_id] = dlg.java_path()
+                else:
+                    overrides.pop(version_id, None)
+                STATE.update_config(java_overrides=overrides)
+                return
+            self.parent_window.java_executable = dlg.java_path()
+            STATE.update_config(username=self.parent_window.username_input.text(),
+                                jvm_args=self.parent_window.jvm_arguments,
+                                java_path=self.parent_window.java_executable)
+
+
+def run_gui(argv):
+    report = "--profile-startup" in argv
+    budget = next((float(a.split("=", 1)[1]) for a in argv if a.startswith("--startup-budget=")), None)
+    trace = next((a.split("=", 1)[1] for a in argv if a.startswith("--trace=")), None)
+    profiler = StartupProfiler()
+    app = QApplication(argv)
+    if trace:
+        app.aboutToQuit.connect(lambda: TRACER.export(trace))
+    profiler.mark("QApplication")
+    launcher = AsphaltLauncher()
+    profiler.mark("window construction")
+    paint_filter = _FirstPaintFilter()
+    paint_filter.painted.connect(lambda: profiler.mark("first paint"))
+    launcher.installEventFilter(paint_filter)
+    launcher.show()
+    profiler.mark("show")
+
+    def done():
+        profiler.mark("version list")
+        launcher.removeEventFilter(paint_filter)
+        record_trace_history("startup", TRACER.since(0, ("startup", "refresh")))
+        if not report:
+            return
+        profiler.report()
+        over = budget is not None and profiler.total() * 1000 > budget
+        if over:
+            print(f"startup budget of {budget:.0f} ms exceeded", file=sys.stderr)
+        launcher.close()
+        app.exit(1 if over else 0)
+
+    launcher.versions_loaded.connect(done)
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(run_gui(sys.argv))
@@ -0,0 +1,66 @@
+import hashlib
+import http.server
+import os
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ["APPDATA"] = tempfile.mkdtemp(prefix="asphalt-tests-")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.pop("ASPHALT_MIRROR", None)
+sys.path[:0] = [ROOT, os.path.join(ROOT, "bench")]
+
+from fake_mojang import DATA, FakeMojang, make_handler  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def fake():
+    return FakeMojang(versions=1, assets=30, libraries=2, client_size=256 << 10)
+
+
+@pytest.fixture
+def mojang(fake):
+    state = SimpleNamespace(requests=[], failures={}, on_request=None, fake=fake)
+
+    class Handler(make_handler(fake)):
+        def do_GET(self):
+            url = "https://" + self.path.lstrip("/")
+            state.requests.append((url, self.headers.get("Range")))
+            if state.on_request:
+                state.on_request(url)
+            pending = state.failures.get(url)
+            if pending:
+                self.send_response(pending.pop(0))
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            super().do_GET()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def engine(mojang):
+    import main
+    engine = main.DownloadEngine(base_url=mojang.url, jobs=4)
+    yield engine
+    engine.close()
+
+
+@pytest.fixture
+def client_jar(fake):
+    url = f"{DATA}bench-0/client.jar"
+    data = fake.get(url)
+    return SimpleNamespace(url=url, data=data, sha1=hashlib.sha1(data).hexdigest())
@@ -0,0 +1,58 @@
+import pytest
+
+from main import DownloadError, DownloadTask
+
+
+def test_fetch_downloads_and_verifies(engine, client_jar, tmp_path):
+    path = tmp_path / "client.jar"
+    assert engine.fetch(DownloadTask(client_jar.url, str(path), client_jar.sha1, len(client_jar.data)))
+    assert path.read_bytes() == client_jar.data
+    assert not engine.fetch(DownloadTask(client_jar.url, str(path), client_jar.sha1, len(client_jar.data)))
+
+
+def test_partial_file_is_resumed_with_range(engine, mojang, client_jar, tmp_path):
+    path = tmp_path / "client.jar"
+    (tmp_path / "client.jar.part").write_bytes(client_jar.data[:1000])
+    assert engine.fetch(DownloadTask(client_jar.url, str(path), client_jar.sha1, len(client_jar.data)))
+    assert path.read_bytes() == client_jar.data
+    assert [r for _, r in mojang.requests] == ["bytes=1000-"]
+    assert not (tmp_path / "client.jar.part").exists()
+
+
+def test_unsatisfiable_range_restarts_download(engine, mojang, client_jar, tmp_path):
+    path = tmp_path / "client.jar"
+    (tmp_path / "client.jar.part").write_bytes(client_jar.data + b"stale")
+    assert engine.fetch(DownloadTask(client_jar.url, str(path), client_jar.sha1))
+    assert path.read_bytes() == client_jar.data
+    assert [r for _, r in mojang.requests] == [f"bytes={len(client_jar.data) + 5}-", None]
+
+
+def test_checksum_mismatch_fails_and_cleans_up(engine, mojang, client_jar, tmp_path):
+    path = tmp_path / "client.jar"
+    with pytest.raises(DownloadError, match="Checksum mismatch"):
+        engine.fetch(DownloadTask(client_jar.url, str(path), "0" * 40, len(client_jar.data)))
+    assert len(mojang.requests) == engine.retries
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_server_errors_are_retried(engine, mojang, client_jar, tmp_path):
+    mojang.failures[client_jar.url] = [503, 500]
+    path = tmp_path / "client.jar"
+    assert engine.fetch(DownloadTask(client_jar.url, str(path), client_jar.sha1, len(client_jar.data)))
+    assert path.read_bytes() == client_jar.data
+    assert len(mojang.requests) == 3
+
+
+def test_persistent_server_error_gives_up(engine, mojang, client_jar, tmp_path):
+    mojang.failures[client_jar.url] = [503] * engine.retries
+    with pytest.raises(DownloadError) as error:
+        engine.fetch(DownloadTask(client_jar.url, str(tmp_path / "client.jar"), client_jar.sha1))
+    assert error.value.status == 503
+    assert len(mojang.requests) == engine.retries
+
+
+def test_not_found_is_not_retried(engine, mojang, tmp_path):
+    with pytest.raises(DownloadError) as error:
+        engine.fetch(DownloadTask("https://piston-data.mojang.com/v1/objects/missing", str(tmp_path / "x"), "0" * 40))
+    assert error.value.status == 404
+    assert len(mojang.requests) == 1
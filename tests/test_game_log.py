@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from main import GameLog, Log4jStreamParser
+
+EVENT = [
+    '<log4j:Event logger="ekx" timestamp="1700000000000" level="WARN" thread="Render thread">\n',
+    '  <log4j:Message><![CDATA[Missing &amp; broken <texture>]]></log4j:Message>\n',
+    '</log4j:Event>\n',
+]
+STAMP = datetime.fromtimestamp(1700000000).strftime("%H:%M:%S")
+
+
+def test_plain_lines_pass_through():
+    parser = Log4jStreamParser()
+    assert parser.feed("Exception in thread main\r\n") == ["Exception in thread main"]
+
+
+def test_event_is_formatted_once_complete():
+    parser = Log4jStreamParser()
+    assert parser.feed(EVENT[0]) == []
+    assert parser.feed(EVENT[1]) == []
+    assert parser.feed(EVENT[2]) == [f"[{STAMP}] [Render thread/WARN]: Missing &amp; broken <texture>"]
+
+
+def test_attributes_are_unescaped():
+    parser = Log4jStreamParser()
+    line = '<log4j:Event timestamp="0" level="INFO" thread="a &amp; b"><log4j:Message><![CDATA[hi]]></log4j:Message></log4j:Event>'
+    assert parser.feed(line)[0].endswith("[a & b/INFO]: hi")
+
+
+def test_throwable_is_appended():
+    parser = Log4jStreamParser()
+    lines = EVENT[:2] + ["  <log4j:Throwable><![CDATA[java.lang.RuntimeException: boom\n\tat Foo.bar]]></log4j:Throwable>\n",
+                         EVENT[2]]
+    out = [text for line in lines for text in parser.feed(line)]
+    assert out == [f"[{STAMP}] [Render thread/WARN]: Missing &amp; broken <texture>\n"
+                   "java.lang.RuntimeException: boom\n\tat Foo.bar"]
+
+
+def test_oversized_event_is_released_raw():
+    parser = Log4jStreamParser(max_event=100)
+    assert parser.feed(EVENT[0]) == []
+    assert parser.feed("x" * 100 + "\n") == [EVENT[0].rstrip("\n"), "x" * 100]
+    assert parser.feed("after\n") == ["after"]
+
+
+def test_flush_returns_incomplete_event():
+    parser = Log4jStreamParser()
+    parser.feed(EVENT[0])
+    assert parser.flush() == [EVENT[0].rstrip("\n")]
+    assert parser.flush() == []
+
+
+def test_game_log_keeps_last_lines_and_writes_file(tmp_path):
+    log = GameLog(str(tmp_path / "logs" / "game.log"), max_lines=3)
+    for n in range(5):
+        log.append(f"line {n}")
+    seq, lines = log.lines_since(0)
+    assert (seq, lines) == (5, ["line 2", "line 3", "line 4"])
+    assert log.lines_since(seq) == (5, [])
+    log.close()
+    assert (tmp_path / "logs" / "game.log").read_text().splitlines() == [f"line {n}" for n in range(5)]
@@ -0,0 +1,63 @@
+import os
+import threading
+
+import pytest
+
+import main
+from main import DownloadEngine, InstallCancelled, install_versions
+
+
+def _files(root):
+    return sorted(os.path.relpath(os.path.join(d, f), root) for d, _, files in os.walk(root) for f in files)
+
+
+def test_install_completes(mojang, tmp_path):
+    engine = DownloadEngine(base_url=mojang.url, jobs=4)
+    try:
+        install_versions(["bench-0"], str(tmp_path), engine=engine)
+    finally:
+        engine.close()
+    assert main.is_install_intact("bench-0", str(tmp_path))
+    assert not any(f.endswith(".part") for f in _files(tmp_path))
+    assert not os.path.exists(main.InstallJournal(str(tmp_path)).path)
+
+
+def test_cancel_rolls_back_new_files(mojang, tmp_path):
+    (tmp_path / "options.txt").write_text("keep me")
+    cancel = threading.Event()
+    assets = []
+
+    def on_request(url):
+        if url.startswith("https://resources.download.minecraft.net/"):
+            assets.append(url)
+            if len(assets) == 5:
+                cancel.set()
+
+    mojang.on_request = on_request
+    engine = DownloadEngine(base_url=mojang.url, jobs=4)
+    try:
+        with pytest.raises(InstallCancelled):
+            install_versions(["bench-0"], str(tmp_path), engine=engine, cancel=cancel)
+    finally:
+        engine.close()
+    assert _files(tmp_path) == ["options.txt"]
+    assert sorted(os.listdir(tmp_path)) == ["options.txt"]
+    assert not os.path.exists(main.InstallJournal(str(tmp_path)).path)
+
+
+def test_cancel_without_rollback_resumes(mojang, tmp_path):
+    cancel = threading.Event()
+    assets = lambda: [u for u, _ in mojang.requests if u.startswith("https://resources.download.minecraft.net/")]
+    mojang.on_request = lambda url: len(assets()) >= 20 and cancel.set()
+    engine = DownloadEngine(base_url=mojang.url, jobs=4)
+    try:
+        with pytest.raises(InstallCancelled):
+            install_versions(["bench-0"], str(tmp_path), engine=engine, cancel=cancel, rollback=False)
+        assert os.path.exists(main.InstallJournal(str(tmp_path)).path)
+        mojang.on_request = None
+        first = len(assets())
+        install_versions(["bench-0"], str(tmp_path), engine=engine)
+    finally:
+        engine.close()
+    assert main.is_install_intact("bench-0", str(tmp_path))
+    assert len(assets()) - first < 30
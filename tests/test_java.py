@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from synthetic import FAKE_JAVA
+
+import main
+from main import JavaRegistry
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="the fake java is a shell script")
+
+
+def _fake_java(root, version):
+    path = os.path.join(root, "bin", "java")
+    os.makedirs(os.path.dirname(path))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(FAKE_JAVA.format(version=version))
+    os.chmod(path, 0o755)
+    return path
+
+
+def test_installed_runtime_replaces_stale_scan(tmp_path, monkeypatch):
+    mc_dir = str(tmp_path / "mc")
+    monkeypatch.setattr(main, "_java_search_roots", lambda mc_dir: [(os.path.join(mc_dir, "runtime"), 3)])
+    registry = JavaRegistry(str(tmp_path / "java.json"))
+    old = _fake_java(os.path.join(mc_dir, "runtime", "jre-legacy", "linux", "jre-legacy"), "1.8.0_51")
+    assert [r.major for r in registry.scan(mc_dir)] == [8]
+    assert registry.best(17, mc_dir) is None
+    root = os.path.join(mc_dir, "runtime", "java-runtime-gamma", "linux", "java-runtime-gamma")
+    new = _fake_java(root, "17.0.8")
+    assert [r.path for r in registry.add(root, mc_dir)] == [os.path.realpath(new)]
+    assert sorted(r.path for r in registry.runtimes(mc_dir)) == sorted(map(os.path.realpath, (old, new)))
+    assert registry.best(17, mc_dir).path == os.path.realpath(new)
@@ -0,0 +1,41 @@
+import pytest
+
+from main import format_memory_size, parse_memory_size, validate_jvm_args
+
+
+@pytest.mark.parametrize("text, size", [
+    ("1024", 1024), ("512k", 512 << 10), ("512m", 512 << 20), ("4G", 4 << 30), (" 2 g ", 2 << 30), ("1t", 1 << 40),
+])
+def test_parse_memory_size(text, size):
+    assert parse_memory_size(text) == size
+
+
+@pytest.mark.parametrize("text", ["", "g", "1.5g", "-1g", "4gb", "12x"])
+def test_parse_memory_size_rejects(text):
+    with pytest.raises(ValueError):
+        parse_memory_size(text)
+
+
+@pytest.mark.parametrize("size", [1000, 512 << 10, 3 << 20, 4 << 30, 1536 << 20])
+def test_format_memory_size_round_trips(size):
+    assert parse_memory_size(format_memory_size(size)) == size
+
+
+def test_valid_args():
+    assert validate_jvm_args(["-Xms1G", "-Xmx4G", "-XX:+UseG1GC", "-XX:MaxMetaspaceSize=512m", "-Dfoo=bar"]) == []
+
+
+def test_invalid_memory_size():
+    assert validate_jvm_args(["-Xmx4GB"]) == ["-Xmx4GB: invalid memory size"]
+
+
+def test_missing_dash():
+    assert validate_jvm_args(["Xmx4G"]) == ["Xmx4G: JVM options must start with '-'"]
+
+
+def test_min_heap_above_max():
+    assert validate_jvm_args(["-Xms8G", "-Xmx4G"]) == ["-Xms is larger than -Xmx"]
+
+
+def test_two_collectors():
+    assert validate_jvm_args(["-XX:+UseG1GC", "-XX:+UseZGC"]) == ["More than one garbage collector selected"]
@@ -0,0 +1,19 @@
+import hashlib
+
+from main import ObjectStore
+
+
+def test_gc_removes_only_unlinked_objects(tmp_path):
+    store = ObjectStore(str(tmp_path / "store"))
+    for name in ("a", "b"):
+        data = name.encode() * 100
+        sha1 = hashlib.sha1(data).hexdigest()
+        src = tmp_path / f"{name}.part"
+        src.write_bytes(data)
+        store.put(str(src), sha1)
+        assert store.link(sha1, str(tmp_path / "mc" / name))
+        assert store.refcount(sha1) == 1
+    (tmp_path / "mc" / "b").unlink()
+    assert store.gc() == (1, 100)
+    assert (tmp_path / "mc" / "a").read_bytes() == b"a" * 100
+    assert store.gc() == (0, 0)